@@ -1,31 +1,135 @@
 """S3 inventory data aggregation and metrics computation."""
 
-from typing import Any, Dict, List
+import heapq
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, DefaultDict, Dict, Iterable, List, Mapping, Tuple, Union
+
+import orjson
+
+# Reciprocals of bytes per KB/GB/TB so conversions multiply instead of
+# divide; powers of two, so the results are bit-identical
+_INV_KB = 1.0 / 1024
+_INV_GB = 1.0 / (1024**3)
+_INV_TB = 1.0 / (1024**4)
+
+# Stringify non-string dict keys the way json.dumps does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps_metrics(metrics: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize bucket or account metrics to JSON.
+    
+    Args:
+        metrics: Metrics dictionary from S3Aggregator
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+    return orjson.dumps(metrics, option=option)
+
+
+def loads_metrics(raw: bytes) -> Dict[str, Any]:
+    """Deserialize metrics written by dumps_metrics.
+    
+    Args:
+        raw: JSON bytes or string
+        
+    Returns:
+        Metrics dictionary
+    """
+    metrics: Dict[str, Any] = orjson.loads(raw)
+    return metrics
+
+
+def _derived_bucket_metrics(
+    object_count: int,
+    total_size: int,
+    storage_classes: Iterable[Tuple[str, int]],
+    recent: int,
+    old: int,
+) -> Tuple[float, float, Dict[str, Any], Dict[str, Any]]:
+    """Compute the derived per-bucket metrics from a bucket's tallies.
+    
+    Args:
+        object_count: Number of objects in the bucket
+        total_size: Total size of the bucket in bytes
+        storage_classes: (storage class, object count) pairs
+        recent: Objects modified in the last 30 days
+        old: Objects modified more than 30 days ago
+        
+    Returns:
+        Tuple of (avg_object_size, avg_object_size_kb, storage_class_breakdown,
+        age_breakdown)
+    """
+    # Compute average object size
+    if object_count > 0:
+        avg_object_size = total_size / object_count
+        pct_per_object = 100.0 / object_count
+    else:
+        avg_object_size = 0
+        pct_per_object = 0
+    
+    # Storage class breakdown with sizes, estimated from the average object
+    # size; an empty bucket reports zeros for every class
+    storage_class_breakdown = {
+        storage_class: {
+            "count": count if object_count > 0 else 0,
+            "size": count * avg_object_size,
+            "size_gb": count * avg_object_size * _INV_GB,
+            "percentage": count * pct_per_object,
+        }
+        for storage_class, count in storage_classes
+    }
+    
+    # Age breakdown percentages
+    total_objects = recent + old
+    if total_objects > 0:
+        age_breakdown = {
+            "recent": {"count": recent, "percentage": (recent / total_objects) * 100},
+            "old": {"count": old, "percentage": (old / total_objects) * 100},
+        }
+    else:
+        age_breakdown = {
+            "recent": {"count": 0, "percentage": 0},
+            "old": {"count": 0, "percentage": 0},
+        }
+    
+    return avg_object_size, avg_object_size * _INV_KB, storage_class_breakdown, age_breakdown
 
 
 class S3Aggregator:
     """Aggregates S3 inventory data and computes metrics."""
     
-    def aggregate_buckets(self, inventory_data: Dict[str, Any]) -> Dict[str, Any]:
+    def aggregate_buckets(
+        self,
+        inventory_data: Union[Mapping[str, Any], Iterable[Tuple[str, Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
         """Aggregate inventory data into per-bucket metrics.
         
+        Buckets are consumed one at a time, so passing an iterator such as
+        S3Inventory.iter_inventory lets aggregation run while inventory is
+        still being collected or read, without holding it all in memory.
+        
         Args:
-            inventory_data: Raw inventory data from S3Inventory
+            inventory_data: Raw inventory data from S3Inventory, as a dict or an
+                iterable of (bucket_name, bucket_data) pairs
             
         Returns:
             Dictionary with aggregated bucket metrics
         """
-        bucket_metrics = {}
-        
-        for bucket_name, bucket_data in inventory_data.items():
-            if "error" in bucket_data:
-                # Skip buckets with errors
-                continue
-                
-            metrics = self._compute_bucket_metrics(bucket_data)
-            bucket_metrics[bucket_name] = metrics
+        if isinstance(inventory_data, Mapping):
+            inventory_data = inventory_data.items()
         
-        return bucket_metrics
+        # Buckets with errors are skipped
+        compute = self._compute_bucket_metrics
+        return {
+            bucket_name: compute(bucket_data)
+            for bucket_name, bucket_data in inventory_data
+            if "error" not in bucket_data
+        }
     
     def aggregate_account(self, bucket_metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Aggregate bucket metrics into account-level summary.
@@ -36,89 +140,96 @@ class S3Aggregator:
         Returns:
             Dictionary with account-level metrics
         """
-        account_metrics = {
-            "bucket_count": len(bucket_metrics),
-            "total_objects": 0,
-            "total_size": 0,
-            "storage_classes": {},
-            "file_extensions": {},
-            "age_buckets": {"recent": 0, "old": 0},
-            "regions": {},
-            "sampled_buckets": 0,
-        }
+        total_objects = 0
+        total_size = 0
+        sampled_buckets = 0
+        recent = 0
+        old = 0
+        regions: Counter = Counter()
         
-        for bucket_name, metrics in bucket_metrics.items():
-            # Sum basic metrics
-            account_metrics["total_objects"] += metrics["object_count"]
-            account_metrics["total_size"] += metrics["total_size"]
-            
-            # Track regions
-            region = metrics["region"]
-            account_metrics["regions"][region] = account_metrics["regions"].get(region, 0) + 1
+        # [count, size] accumulators, materialized into dicts once at the end.
+        # One small list per category is updated in place; immutable tuples
+        # would be reallocated on every update, and element-wise updates to a
+        # NumPy record array cost more per store than list item assignment
+        sc_acc: DefaultDict[str, List[float]] = defaultdict(lambda: [0, 0])
+        ext_acc: DefaultDict[str, List[float]] = defaultdict(lambda: [0, 0])
+        
+        # Everything is tallied in one pass over the buckets. The per-bucket
+        # breakdowns live in small dicts, so reading them dominates the cost;
+        # accumulating as they are read beats flattening them into arrays for
+        # a vectorized reduction at any account size
+        for metrics in bucket_metrics.values():
+            object_count = metrics["object_count"]
+            bucket_size = metrics["total_size"]
+            total_objects += object_count
+            total_size += bucket_size
             
-            # Track sampled buckets
             if metrics["sampled"]:
-                account_metrics["sampled_buckets"] += 1
+                sampled_buckets += 1
+            
+            age_buckets = metrics["age_buckets"]
+            recent += age_buckets["recent"]
+            old += age_buckets["old"]
             
-            # Aggregate storage classes
+            regions[metrics["region"]] += 1
+            
+            # Storage class sizes are estimated proportionally to object count
+            avg_object_size = bucket_size / object_count if object_count > 0 else 0
             for storage_class, count in metrics["storage_classes"].items():
-                if storage_class not in account_metrics["storage_classes"]:
-                    account_metrics["storage_classes"][storage_class] = {
-                        "count": 0,
-                        "size": 0,
-                        "size_gb": 0
-                    }
-                account_metrics["storage_classes"][storage_class]["count"] += count
-                
-                # Estimate size for this storage class (proportional to object count)
-                if metrics["object_count"] > 0:
-                    avg_object_size = metrics["total_size"] / metrics["object_count"]
-                    estimated_size = count * avg_object_size
-                    account_metrics["storage_classes"][storage_class]["size"] += estimated_size
-                    account_metrics["storage_classes"][storage_class]["size_gb"] = (
-                        account_metrics["storage_classes"][storage_class]["size"] / (1024**3)
-                    )
+                acc = sc_acc[storage_class]
+                acc[0] += count
+                acc[1] += count * avg_object_size
             
-            # Aggregate file extensions
             for ext, ext_data in metrics["file_extensions"].items():
-                if ext not in account_metrics["file_extensions"]:
-                    account_metrics["file_extensions"][ext] = {
-                        "count": 0,
-                        "size": 0,
-                        "size_gb": 0
-                    }
-                account_metrics["file_extensions"][ext]["count"] += ext_data["count"]
-                account_metrics["file_extensions"][ext]["size"] += ext_data["size"]
-                account_metrics["file_extensions"][ext]["size_gb"] = (
-                    account_metrics["file_extensions"][ext]["size"] / (1024**3)
-                )
-            
-            # Aggregate age buckets
-            account_metrics["age_buckets"]["recent"] += metrics["age_buckets"]["recent"]
-            account_metrics["age_buckets"]["old"] += metrics["age_buckets"]["old"]
+                acc = ext_acc[ext]
+                acc[0] += ext_data["count"]
+                acc[1] += ext_data["size"]
+        
+        account_metrics = {
+            "bucket_count": len(bucket_metrics),
+            "total_objects": total_objects,
+            "total_size": total_size,
+            "storage_classes": self._materialize_breakdown(sc_acc.items()),
+            "file_extensions": self._materialize_breakdown(ext_acc.items(), sort_by_count=True),
+            "age_buckets": {"recent": recent, "old": old},
+            "regions": dict(regions),
+            "sampled_buckets": sampled_buckets,
+        }
         
         # Compute derived metrics
-        if account_metrics["total_objects"] > 0:
-            account_metrics["avg_object_size"] = account_metrics["total_size"] / account_metrics["total_objects"]
-            account_metrics["avg_object_size_kb"] = account_metrics["avg_object_size"] / 1024
+        if total_objects > 0:
+            avg_object_size = total_size / total_objects
+            account_metrics["avg_object_size"] = avg_object_size
+            account_metrics["avg_object_size_kb"] = avg_object_size * _INV_KB
         else:
             account_metrics["avg_object_size"] = 0
             account_metrics["avg_object_size_kb"] = 0
         
-        account_metrics["total_size_gb"] = account_metrics["total_size"] / (1024**3)
-        account_metrics["total_size_tb"] = account_metrics["total_size"] / (1024**4)
-        
-        # Sort file extensions by count
-        account_metrics["file_extensions"] = dict(
-            sorted(
-                account_metrics["file_extensions"].items(),
-                key=lambda x: x[1]["count"],
-                reverse=True
-            )
-        )
+        account_metrics["total_size_gb"] = total_size * _INV_GB
+        account_metrics["total_size_tb"] = total_size * _INV_TB
         
         return account_metrics
     
+    def _materialize_breakdown(
+        self, totals: Iterable[Tuple[str, List[float]]], sort_by_count: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Build the per-category breakdown dict from [count, size] accumulators.
+        
+        Args:
+            totals: Pairs of category and [count, size] totals
+            sort_by_count: Order categories by descending object count
+            
+        Returns:
+            Dictionary mapping each category to its count, size and size_gb
+        """
+        if sort_by_count:
+            totals = sorted(totals, key=lambda x: x[1][0], reverse=True)
+        
+        return {
+            key: {"count": count, "size": size, "size_gb": size * _INV_GB}
+            for key, (count, size) in totals
+        }
+    
     def _compute_bucket_metrics(self, bucket_data: Dict[str, Any]) -> Dict[str, Any]:
         """Compute metrics for a single bucket.
         
@@ -136,8 +247,8 @@ class S3Aggregator:
             "region": bucket_data["region"],
             "object_count": object_count,
             "total_size": total_size,
-            "total_size_gb": total_size / (1024**3),
-            "total_size_tb": total_size / (1024**4),
+            "total_size_gb": total_size * _INV_GB,
+            "total_size_tb": total_size * _INV_TB,
             "sampled": bucket_data.get("sampled", False),
             "sample_size": bucket_data.get("sample_size", object_count),
             "storage_classes": bucket_data["storage_classes"],
@@ -146,54 +257,33 @@ class S3Aggregator:
             "inventory_date": bucket_data["inventory_date"],
         }
         
-        # Compute average object size
-        if object_count > 0:
-            metrics["avg_object_size"] = total_size / object_count
-            metrics["avg_object_size_kb"] = metrics["avg_object_size"] / 1024
-        else:
+        if object_count == 0:
+            # Empty buckets have no sizes or ages to break down
             metrics["avg_object_size"] = 0
-            metrics["avg_object_size_kb"] = 0
-        
-        # Add storage class breakdown with sizes
-        storage_class_breakdown = {}
-        for storage_class, count in bucket_data["storage_classes"].items():
-            if object_count > 0:
-                avg_object_size = total_size / object_count
-                estimated_size = count * avg_object_size
-                storage_class_breakdown[storage_class] = {
-                    "count": count,
-                    "size": estimated_size,
-                    "size_gb": estimated_size / (1024**3),
-                    "percentage": (count / object_count) * 100
-                }
-            else:
-                storage_class_breakdown[storage_class] = {
-                    "count": 0,
-                    "size": 0,
-                    "size_gb": 0,
-                    "percentage": 0
-                }
-        
-        metrics["storage_class_breakdown"] = storage_class_breakdown
-        
-        # Add age breakdown percentages
-        total_objects = bucket_data["age_buckets"]["recent"] + bucket_data["age_buckets"]["old"]
-        if total_objects > 0:
-            metrics["age_breakdown"] = {
-                "recent": {
-                    "count": bucket_data["age_buckets"]["recent"],
-                    "percentage": (bucket_data["age_buckets"]["recent"] / total_objects) * 100
-                },
-                "old": {
-                    "count": bucket_data["age_buckets"]["old"],
-                    "percentage": (bucket_data["age_buckets"]["old"] / total_objects) * 100
-                }
+            metrics["avg_object_size_kb"] = 0.0
+            metrics["storage_class_breakdown"] = {
+                storage_class: {"count": 0, "size": 0, "size_gb": 0.0, "percentage": 0}
+                for storage_class in bucket_data["storage_classes"]
             }
-        else:
             metrics["age_breakdown"] = {
                 "recent": {"count": 0, "percentage": 0},
-                "old": {"count": 0, "percentage": 0}
+                "old": {"count": 0, "percentage": 0},
             }
+            return metrics
+        
+        age_buckets = bucket_data["age_buckets"]
+        (
+            metrics["avg_object_size"],
+            metrics["avg_object_size_kb"],
+            metrics["storage_class_breakdown"],
+            metrics["age_breakdown"],
+        ) = _derived_bucket_metrics(
+            object_count,
+            total_size,
+            bucket_data["storage_classes"].items(),
+            age_buckets["recent"],
+            age_buckets["old"],
+        )
         
         return metrics
     
@@ -208,13 +298,11 @@ class S3Aggregator:
         Returns:
             List of top bucket metrics
         """
-        sorted_buckets = sorted(
-            bucket_metrics.items(),
-            key=lambda x: x[1][sort_by],
-            reverse=True
-        )[:top_n]
+        # Extract the sort key once per bucket so the heap compares plain values
+        entries = [(metrics[sort_by], name, metrics) for name, metrics in bucket_metrics.items()]
+        top_entries = heapq.nlargest(top_n, entries, key=itemgetter(0))
         
-        return [{"bucket_name": name, **metrics} for name, metrics in sorted_buckets]
+        return [{"bucket_name": name, **metrics} for _, name, metrics in top_entries]
     
     def get_top_extensions(self, account_metrics: Dict[str, Any], top_n: int = 10) -> List[Dict[str, Any]]:
         """Get top N file extensions.
@@ -226,10 +314,8 @@ class S3Aggregator:
         Returns:
             List of top extension metrics
         """
-        sorted_extensions = sorted(
-            account_metrics["file_extensions"].items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )[:top_n]
+        sorted_extensions = heapq.nlargest(
+            top_n, account_metrics["file_extensions"].items(), key=lambda x: x[1]["count"]
+        )
         
         return [{"extension": ext, **data} for ext, data in sorted_extensions] 
\ No newline at end of file
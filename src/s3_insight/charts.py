@@ -1,34 +1,131 @@
 """Chart generation module for S3 inventory data."""
 
+import glob
+import hashlib
+import heapq
+import json
 import os
-from typing import Any, Dict, List, Tuple
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.figure import Figure
+import matplotlib
+import numpy as np
+
+# Charts are only written to files; select the non-interactive backend before
+# pyplot is imported so no GUI backend is initialized in any worker process
+matplotlib.use("Agg")
+
+import matplotlib.patches as mpatches  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from . import __version__  # noqa: E402
+
+# (chart name, file name stem, module-level render function, data arguments)
+_ChartTask = Tuple[str, str, Callable[..., str], Tuple[Any, ...]]
+
+# zlib level 6 (the default) dominates savefig time; level 1 encodes several
+# times faster for slightly larger files
+_PNG_SAVE_ARGS: Dict[str, Any] = {"compress_level": 1, "optimize": False}
+
+_STYLE_SET = False
+
+# Colormap lookup tables sampled once; charts index into them rather than
+# calling the colormap (which builds a new RGBA array) for every chart
+_SET3_COLORS = plt.cm.Set3(np.arange(plt.cm.Set3.N))
+_VIRIDIS_COLORS = plt.cm.viridis(np.arange(plt.cm.viridis.N))
+_PLASMA_COLORS = plt.cm.plasma(np.arange(plt.cm.plasma.N))
+_COOLWARM_COLORS = plt.cm.coolwarm(np.arange(plt.cm.coolwarm.N))
+_TAB10_COLORS = plt.cm.tab10(np.arange(plt.cm.tab10.N))
+
+# Green for recent, red for old
+_AGE_COLORS = ['#2ecc71', '#e74c3c']
+_AGE_LABELS = ['Recent (≤30 days)', 'Old (>30 days)']
+
+# Figure reused by every chart rendered in this process
+_FIGURE: Optional[Figure] = None
+
+# PNG encoding runs on background threads (zlib releases the GIL) so the next
+# chart can be drawn while the previous one is compressed
+_ENCODER: Optional[ThreadPoolExecutor] = None
+_PENDING_ENCODES: List[Future] = []
+
+# Single-category charts (one storage class, one region, ...) convey nothing a
+# table does not, so they are skipped; likewise an age split this lopsided
+MIN_CATEGORIES_FOR_CHART = 2
+_AGE_DOMINANCE = 0.99
+
+# Chart output backends: rasterized PNGs, or Vega-Lite JSON specs that a
+# browser renders client-side (e.g. with vega-embed)
+CHART_BACKENDS = ("matplotlib", "vega-lite")
+
+_VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+# Buckets shown in the top buckets chart and in the dashboard panel
+TOP_BUCKETS = 10
+_DASHBOARD_TOP_BUCKETS = 5
+
+# Account-level metrics plotted on the dashboard
+_DASHBOARD_FIELDS = ("file_extensions", "storage_classes", "age_buckets", "regions")
+
+# Cached images are named <stem>_<content key>.png
+_CONTENT_KEY_BYTES = 12
+
+
+def _apply_style() -> None:
+    """Apply the chart style to matplotlib's global rcParams once per process."""
+    global _STYLE_SET
+    if _STYLE_SET:
+        return
+    
+    plt.style.use('default')
+    plt.rcParams['figure.figsize'] = (12, 8)
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['axes.titlesize'] = 14
+    plt.rcParams['axes.labelsize'] = 12
+    _STYLE_SET = True
 
 
 class ChartGenerator:
     """Generates charts from S3 inventory data."""
     
-    def __init__(self, output_dir: str = "~/charts", dpi: int = 300) -> None:
+    def __init__(
+        self,
+        output_dir: str = "~/charts",
+        dpi: int = 150,
+        max_workers: int = 6,
+        backend: str = "matplotlib",
+        min_categories: int = MIN_CATEGORIES_FOR_CHART,
+    ) -> None:
         """Initialize the chart generator.
         
         Args:
             output_dir: Directory to save charts
             dpi: DPI for chart images
+            max_workers: Maximum number of chart rendering processes
+            backend: Chart backend, "matplotlib" for PNG images or "vega-lite"
+                for JSON specs rendered client-side
+            min_categories: Minimum number of categories a chart must have to
+                be drawn
+            
+        Raises:
+            ValueError: If backend is not one of CHART_BACKENDS
         """
+        if backend not in CHART_BACKENDS:
+            raise ValueError(
+                f"Unknown chart backend {backend!r}; expected one of {CHART_BACKENDS}"
+            )
+        
         # Expand user path for output directory
         self.output_dir = os.path.expanduser(output_dir)
         self.dpi = dpi
+        self.max_workers = max_workers
+        self.backend = backend
+        self.min_categories = min_categories
         os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Set matplotlib style
-        plt.style.use('default')
-        plt.rcParams['figure.figsize'] = (12, 8)
-        plt.rcParams['font.size'] = 10
-        plt.rcParams['axes.titlesize'] = 14
-        plt.rcParams['axes.labelsize'] = 12
     
     def generate_charts(
         self,
@@ -44,370 +141,852 @@ class ChartGenerator:
             top_extensions: Number of top extensions to show
             
         Returns:
-            Dictionary mapping chart names to file paths
+            Dictionary mapping chart names to file paths. Charts with too few
+            categories to be informative are omitted.
         """
-        charts = {}
+        # Collect the charts that have data to plot; each entry is rendered by a
+        # module-level function so it can run in a separate process
+        tasks: List[_ChartTask] = []
+        min_categories = self.min_categories
+        age_buckets = account_metrics["age_buckets"]
+        age_total = age_buckets["recent"] + age_buckets["old"]
+        
+        # Charts get only the values they plot, which also keys their cache;
+        # the rest of the bucket metrics (e.g. inventory_date) change every run
+        top_buckets = [
+            (name, metrics["total_size_gb"])
+            for name, metrics in heapq.nlargest(
+                TOP_BUCKETS, bucket_metrics.items(), key=lambda x: x[1]["total_size_gb"]
+            )
+        ]
+        dashboard_metrics = {field: account_metrics[field] for field in _DASHBOARD_FIELDS}
         
         # File type distribution pie chart
-        if account_metrics["file_extensions"]:
-            charts["filetype_pie"] = self._create_filetype_pie_chart(
-                account_metrics["file_extensions"], top_extensions
-            )
+        if len(account_metrics["file_extensions"]) >= min_categories:
+            tasks.append((
+                "filetype_pie",
+                "filetype_pie",
+                _create_filetype_pie_chart,
+                (account_metrics["file_extensions"], top_extensions),
+            ))
         
         # Storage class distribution bar chart
-        if account_metrics["storage_classes"]:
-            charts["storageclass_bar"] = self._create_storage_class_bar_chart(
-                account_metrics["storage_classes"]
-            )
+        if len(account_metrics["storage_classes"]) >= min_categories:
+            tasks.append((
+                "storageclass_bar",
+                "storageclass_bar",
+                _create_storage_class_bar_chart,
+                (account_metrics["storage_classes"],),
+            ))
         
         # Top buckets by size bar chart
-        if bucket_metrics:
-            charts["top_buckets_bar"] = self._create_top_buckets_chart(bucket_metrics)
+        if len(bucket_metrics) >= min_categories:
+            tasks.append((
+                "top_buckets_bar",
+                "top_buckets_bar",
+                _create_top_buckets_chart,
+                (top_buckets,),
+            ))
         
         # Age distribution pie chart
-        if account_metrics["age_buckets"]["recent"] > 0 or account_metrics["age_buckets"]["old"] > 0:
-            charts["age_distribution_pie"] = self._create_age_distribution_chart(
-                account_metrics["age_buckets"]
-            )
+        if age_total > 0 and max(age_buckets.values()) <= _AGE_DOMINANCE * age_total:
+            tasks.append((
+                "age_distribution_pie",
+                "age_distribution_pie",
+                _create_age_distribution_chart,
+                (account_metrics["age_buckets"],),
+            ))
         
         # Region distribution pie chart
-        if account_metrics["regions"]:
-            charts["region_distribution_pie"] = self._create_region_distribution_chart(
-                account_metrics["regions"]
-            )
-        
-        # Create comprehensive dashboard
-        if charts:
-            charts["dashboard"] = self._create_comprehensive_dashboard(
-                bucket_metrics, account_metrics, charts, top_extensions
-            )
-        
-        return charts
+        if len(account_metrics["regions"]) >= min_categories:
+            tasks.append((
+                "region_distribution_pie",
+                "region_distribution_pie",
+                _create_region_distribution_chart,
+                (account_metrics["regions"],),
+            ))
+        
+        # Create comprehensive dashboard whenever there is anything to show
+        if (
+            account_metrics["file_extensions"]
+            or account_metrics["storage_classes"]
+            or bucket_metrics
+            or age_total > 0
+            or account_metrics["regions"]
+        ):
+            tasks.append((
+                "dashboard",
+                "comprehensive_dashboard",
+                _create_comprehensive_dashboard,
+                (top_buckets[:_DASHBOARD_TOP_BUCKETS], dashboard_metrics, top_extensions),
+            ))
+        
+        if self.backend == "vega-lite":
+            return self._write_specs(tasks)
+        
+        return self._render_charts(tasks)
     
-    def _create_filetype_pie_chart(self, file_extensions: Dict[str, Any], top_n: int) -> str:
-        """Create pie chart for file type distribution.
+    def _write_specs(self, tasks: List[_ChartTask]) -> Dict[str, str]:
+        """Write a Vega-Lite spec for each chart instead of rendering an image.
+        
+        Building a spec is plain dict construction, so unlike PNG rendering it
+        needs neither worker processes nor the content-hash cache.
         
         Args:
-            file_extensions: File extension data
-            top_n: Number of top extensions to show
+            tasks: List of (chart name, file stem, render function, data arguments)
             
         Returns:
-            Path to saved chart file
+            Dictionary mapping chart names to spec file paths
         """
-        # Get top N extensions by count
-        sorted_exts = sorted(
-            file_extensions.items(),
-            key=lambda x: x[1]["count"],
-            reverse=True
-        )[:top_n]
-        
-        # Prepare data
-        labels = []
-        sizes = []
-        colors = plt.cm.Set3(range(len(sorted_exts)))
-        
-        for ext, data in sorted_exts:
-            label = ext if ext != "no-extension" else "No Extension"
-            labels.append(label)
-            sizes.append(data["count"])
-        
-        # Create chart
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            textprops={'fontsize': 10}
-        )
-        
-        # Enhance text appearance
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
+        chart_files = {}
         
-        ax.set_title('File Type Distribution (by Object Count)', fontsize=16, fontweight='bold', pad=20)
-        
-        # Add legend
-        legend_elements = [
-            mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]:,} objects")
-            for i in range(len(labels))
-        ]
-        ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
+        for name, stem, _, args in tasks:
+            spec = {"$schema": _VEGA_LITE_SCHEMA, **_SPEC_BUILDERS[name](*args)}
+            filename = os.path.join(self.output_dir, f"{stem}.vl.json")
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(spec, f, separators=(',', ':'), ensure_ascii=False)
+            chart_files[name] = filename
         
-        plt.tight_layout()
-        
-        # Save chart
-        filename = os.path.join(self.output_dir, "filetype_pie.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        return chart_files
     
-    def _create_storage_class_bar_chart(self, storage_classes: Dict[str, Any]) -> str:
-        """Create bar chart for storage class distribution.
+    def _render_charts(self, tasks: List[_ChartTask]) -> Dict[str, str]:
+        """Render charts whose input data changed since they were last drawn.
         
-        Args:
-            storage_classes: Storage class data
-            
-        Returns:
-            Path to saved chart file
-        """
-        # Prepare data
-        classes = list(storage_classes.keys())
-        counts = [storage_classes[cls]["count"] for cls in classes]
-        sizes_gb = [storage_classes[cls]["size_gb"] for cls in classes]
-        
-        # Create subplots
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-        
-        # Object count chart
-        bars1 = ax1.bar(classes, counts, color=plt.cm.viridis(range(len(classes))))
-        ax1.set_title('Storage Class Distribution (by Object Count)', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Number of Objects')
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Add value labels on bars
-        for bar, count in zip(bars1, counts):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{count:,}', ha='center', va='bottom', fontweight='bold')
-        
-        # Size chart
-        bars2 = ax2.bar(classes, sizes_gb, color=plt.cm.plasma(range(len(classes))))
-        ax2.set_title('Storage Class Distribution (by Size)', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Size (GB)')
-        ax2.tick_params(axis='x', rotation=45)
-        
-        # Add value labels on bars
-        for bar, size in zip(bars2, sizes_gb):
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'{size:.1f} GB', ha='center', va='bottom', fontweight='bold')
-        
-        plt.tight_layout()
-        
-        # Save chart
-        filename = os.path.join(self.output_dir, "storageclass_bar.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
-        
-        return filename
-    
-    def _create_top_buckets_chart(self, bucket_metrics: Dict[str, Any], top_n: int = 10) -> str:
-        """Create bar chart for top buckets by size.
+        Charts are pure functions of their inputs, so each image is named after
+        a hash of the data it plots and only missing images are rendered. The
+        stable <chart>.png path is then pointed at the current image.
         
         Args:
-            bucket_metrics: Per-bucket metrics
-            top_n: Number of top buckets to show
+            tasks: List of (chart name, file stem, render function, data arguments)
             
         Returns:
-            Path to saved chart file
+            Dictionary mapping chart names to file paths
         """
-        # Get top buckets by size
-        sorted_buckets = sorted(
-            bucket_metrics.items(),
-            key=lambda x: x[1]["total_size_gb"],
-            reverse=True
-        )[:top_n]
-        
-        bucket_names = [name for name, _ in sorted_buckets]
-        sizes_gb = [metrics["total_size_gb"] for _, metrics in sorted_buckets]
-        
-        # Create chart
-        fig, ax = plt.subplots(figsize=(14, 8))
+        cached_files = {}
+        pending = []
         
-        bars = ax.barh(bucket_names, sizes_gb, color=plt.cm.coolwarm(range(len(bucket_names))))
-        ax.set_title(f'Top {top_n} Buckets by Size', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Size (GB)')
-        
-        # Add value labels on bars
-        for bar, size in zip(bars, sizes_gb):
-            width = bar.get_width()
-            ax.text(width + width*0.01, bar.get_y() + bar.get_height()/2,
-                   f'{size:.1f} GB', ha='left', va='center', fontweight='bold')
-        
-        # Invert y-axis to show largest at top
-        ax.invert_yaxis()
-        
-        plt.tight_layout()
+        for name, stem, render, args in tasks:
+            filename = os.path.join(
+                self.output_dir, f"{stem}_{_content_key(self.dpi, args)}.png"
+            )
+            cached_files[name] = filename
+            if not os.path.exists(filename):
+                pending.append((filename, render, args))
         
-        # Save chart
-        filename = os.path.join(self.output_dir, "top_buckets_bar.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
+        self._render_pending(pending)
         
-        return filename
+        return {
+            name: _link_latest(
+                cached_files[name], os.path.join(self.output_dir, f"{stem}.png")
+            )
+            for name, stem, _, _ in tasks
+        }
     
-    def _create_age_distribution_chart(self, age_buckets: Dict[str, int]) -> str:
-        """Create pie chart for object age distribution.
+    def _render_pending(
+        self, pending: List[Tuple[str, Callable[..., str], Tuple[Any, ...]]]
+    ) -> None:
+        """Render charts, in parallel processes when more than one core is available.
+        
+        Rendering and PNG encoding are CPU-bound and independent between charts.
+        Worker processes also sidestep pyplot's global, non thread-safe state.
+        Each chart is written to a temporary file and moved into place once
+        complete, so an interrupted run never leaves a truncated cached image.
         
         Args:
-            age_buckets: Age bucket data
-            
-        Returns:
-            Path to saved chart file
+            pending: List of (target file path, render function, data arguments)
         """
-        labels = ['Recent (≤30 days)', 'Old (>30 days)']
-        sizes = [age_buckets["recent"], age_buckets["old"]]
-        colors = ['#2ecc71', '#e74c3c']  # Green for recent, red for old
-        
-        # Create chart
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
+        max_workers = min(len(pending), os.cpu_count() or 1, self.max_workers)
+        
+        if max_workers <= 1:
+            _apply_style()
+            rendered = [
+                (render(_temp_path(filename), self.dpi, *args), filename)
+                for filename, render, args in pending
+            ]
+            _wait_for_encodes()
+            for temp_filename, filename in rendered:
+                os.replace(temp_filename, filename)
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_apply_style
+        ) as executor:
+            futures = {
+                filename: executor.submit(
+                    _render_and_encode, render, _temp_path(filename), self.dpi, args
+                )
+                for filename, render, args in pending
+            }
+            for filename, future in futures.items():
+                os.replace(future.result(), filename)
+
+
+def _colors(lut: np.ndarray, n: int) -> np.ndarray:
+    """Return the first n colors of a colormap lookup table.
+    
+    Indices past the end of the table repeat its last color, matching how a
+    colormap maps out-of-range integers.
+    
+    Args:
+        lut: RGBA lookup table sampled from a colormap
+        n: Number of colors needed
+        
+    Returns:
+        Array of n RGBA colors
+    """
+    return lut[np.minimum(np.arange(n), len(lut) - 1)]
+
+
+def _reuse_figure(figsize: Tuple[float, float]) -> Figure:
+    """Return this process's chart figure, cleared and resized.
+    
+    Reusing one figure avoids allocating a new figure and Agg canvas for
+    every chart rendered in the same process.
+    
+    Args:
+        figsize: Figure size in inches
+        
+    Returns:
+        Empty figure of the requested size
+    """
+    global _FIGURE
+    if _FIGURE is None:
+        # Constrained layout is solved once while drawing, replacing a separate
+        # tight_layout pass per chart; it also makes room for outside legends
+        _FIGURE = plt.figure(figsize=figsize, layout="constrained")
+    else:
+        _FIGURE.clear()
+        _FIGURE.set_size_inches(figsize)
+    return _FIGURE
+
+
+def _save_figure(fig: Figure, filename: str, dpi: int) -> str:
+    """Draw a chart figure and queue its PNG encoding.
+    
+    The figure is rasterized here, then the pixels are copied so the figure
+    can be reused while a background thread encodes them. Call
+    _wait_for_encodes before reading the file.
+    
+    Args:
+        fig: Figure to save
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        
+    Returns:
+        Path the chart image is written to
+    """
+    global _ENCODER
+    
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    pixels = np.array(cast(FigureCanvasAgg, fig.canvas).buffer_rgba())
+    
+    if _ENCODER is None:
+        _ENCODER = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    _PENDING_ENCODES.append(_ENCODER.submit(_encode_png, pixels, filename, dpi))
+    
+    return filename
+
+
+def _encode_png(pixels: np.ndarray, filename: str, dpi: int) -> None:
+    """Encode an RGBA pixel buffer to a PNG file.
+    
+    Args:
+        pixels: RGBA pixels of shape (height, width, 4)
+        filename: Path to save the chart image
+        dpi: DPI recorded in the image metadata
+    """
+    Image.fromarray(pixels, "RGBA").save(filename, dpi=(dpi, dpi), **_PNG_SAVE_ARGS)
+
+
+def _wait_for_encodes() -> None:
+    """Block until every queued PNG encode in this process has been written."""
+    while _PENDING_ENCODES:
+        _PENDING_ENCODES.pop().result()
+
+
+def _reset_encoder() -> None:
+    """Drop the encoder inherited from the parent; its threads don't survive fork."""
+    global _ENCODER
+    _ENCODER = None
+    _PENDING_ENCODES.clear()
+
+
+# Worker processes forked after this process rendered charts itself would
+# otherwise queue encodes on a pool without threads and wait forever
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_encoder)
+
+
+def _render_and_encode(
+    render: Callable[..., str], filename: str, dpi: int, args: Tuple[Any, ...]
+) -> str:
+    """Render a chart in a worker process and wait for its PNG to be written.
+    
+    Args:
+        render: Chart render function
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        args: Data arguments passed to the render function
+        
+    Returns:
+        Path to saved chart file
+    """
+    render(filename, dpi, *args)
+    _wait_for_encodes()
+    return filename
+
+
+def _content_key(dpi: int, args: Tuple[Any, ...]) -> str:
+    """Hash the data a chart plots into a short cache key.
+    
+    Args:
+        dpi: DPI the chart is rendered at
+        args: Data arguments passed to the render function
+        
+    Returns:
+        Hex digest identifying the chart content
+    """
+    payload = json.dumps([__version__, dpi, args], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=_CONTENT_KEY_BYTES).hexdigest()
+
+
+def _temp_path(filename: str) -> str:
+    """Return the in-progress path a chart is rendered to before being moved."""
+    root, ext = os.path.splitext(filename)
+    return f"{root}.tmp{ext}"
+
+
+def _link_latest(target: str, link: str) -> str:
+    """Point a stable chart path at the current content-addressed image.
+    
+    Images cached for earlier data are removed once the link is updated, so
+    only the current image of each chart is kept.
+    
+    Args:
+        target: Content-addressed chart image
+        link: Stable chart path consumers refer to
+        
+    Returns:
+        The stable chart path
+    """
+    tmp_link = _temp_path(link)
+    try:
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        os.symlink(os.path.basename(target), tmp_link)
+        os.replace(tmp_link, link)
+    except OSError:
+        # Filesystems without symlink support get a copy instead
+        shutil.copyfile(target, link)
+    
+    stale_pattern = (
+        f"{glob.escape(os.path.splitext(link)[0])}_{'[0-9a-f]' * (2 * _CONTENT_KEY_BYTES)}.png"
+    )
+    for stale in glob.glob(stale_pattern):
+        if stale != target:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+    return link
+
+
+def _create_filetype_pie_chart(
+    filename: str, dpi: int, file_extensions: Dict[str, Any], top_n: int
+) -> str:
+    """Create pie chart for file type distribution.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        file_extensions: File extension data
+        top_n: Number of top extensions to show
+        
+    Returns:
+        Path to saved chart file
+    """
+    # Get top N extensions by count
+    sorted_exts = heapq.nlargest(
+        top_n, file_extensions.items(), key=lambda x: x[1]["count"]
+    )
+    
+    # Prepare data
+    labels = []
+    sizes = []
+    colors = _colors(_SET3_COLORS, len(sorted_exts))
+    
+    for ext, data in sorted_exts:
+        label = ext if ext != "no-extension" else "No Extension"
+        labels.append(label)
+        sizes.append(data["count"])
+    
+    # Create chart
+    fig = _reuse_figure((12, 8))
+    ax = fig.subplots()
+    
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        textprops={'fontsize': 10}
+    )
+    
+    # Enhance text appearance
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    
+    ax.set_title('File Type Distribution (by Object Count)', fontsize=16, fontweight='bold', pad=20)
+    
+    # Add legend
+    legend_elements = [
+        mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]:,} objects")
+        for i in range(len(labels))
+    ]
+    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
+    
+    return _save_figure(fig, filename, dpi)
+
+
+def _create_storage_class_bar_chart(
+    filename: str, dpi: int, storage_classes: Dict[str, Any]
+) -> str:
+    """Create bar chart for storage class distribution.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        storage_classes: Storage class data
+        
+    Returns:
+        Path to saved chart file
+    """
+    # Prepare data
+    classes = list(storage_classes.keys())
+    counts = [storage_classes[cls]["count"] for cls in classes]
+    sizes_gb = [storage_classes[cls]["size_gb"] for cls in classes]
+    
+    # Create subplots
+    fig = _reuse_figure((12, 10))
+    ax1, ax2 = fig.subplots(2, 1)
+    
+    # Object count chart
+    bars1 = ax1.bar(classes, counts, color=_colors(_VIRIDIS_COLORS, len(classes)))
+    ax1.set_title('Storage Class Distribution (by Object Count)', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Number of Objects')
+    ax1.tick_params(axis='x', rotation=45)
+    
+    # Add value labels on bars
+    ax1.bar_label(
+        bars1, labels=[f'{count:,}' for count in counts], padding=3, fontweight='bold'
+    )
+    
+    # Size chart
+    bars2 = ax2.bar(classes, sizes_gb, color=_colors(_PLASMA_COLORS, len(classes)))
+    ax2.set_title('Storage Class Distribution (by Size)', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Size (GB)')
+    ax2.tick_params(axis='x', rotation=45)
+    
+    # Add value labels on bars
+    ax2.bar_label(
+        bars2, labels=[f'{size:.1f} GB' for size in sizes_gb], padding=3, fontweight='bold'
+    )
+    
+    return _save_figure(fig, filename, dpi)
+
+
+def _create_top_buckets_chart(
+    filename: str, dpi: int, top_buckets: List[Tuple[str, float]], top_n: int = TOP_BUCKETS
+) -> str:
+    """Create bar chart for top buckets by size.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        top_buckets: (bucket name, size in GB) pairs, largest first
+        top_n: Number of top buckets shown in the title
+        
+    Returns:
+        Path to saved chart file
+    """
+    bucket_names = [name for name, _ in top_buckets]
+    sizes_gb = [size_gb for _, size_gb in top_buckets]
+    
+    # Create chart
+    fig = _reuse_figure((14, 8))
+    ax = fig.subplots()
+    
+    bars = ax.barh(bucket_names, sizes_gb, color=_colors(_COOLWARM_COLORS, len(bucket_names)))
+    ax.set_title(f'Top {top_n} Buckets by Size', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Size (GB)')
+    
+    # Add value labels on bars
+    ax.bar_label(
+        bars,
+        labels=[f'{size:.1f} GB' for size in sizes_gb],
+        label_type='edge',
+        padding=3,
+        fontweight='bold',
+    )
+    
+    # Invert y-axis to show largest at top
+    ax.invert_yaxis()
+    
+    return _save_figure(fig, filename, dpi)
+
+
+def _create_age_distribution_chart(
+    filename: str, dpi: int, age_buckets: Dict[str, int]
+) -> str:
+    """Create pie chart for object age distribution.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        age_buckets: Age bucket data
+        
+    Returns:
+        Path to saved chart file
+    """
+    labels = _AGE_LABELS
+    sizes = [age_buckets["recent"], age_buckets["old"]]
+    colors = _AGE_COLORS
+    
+    # Create chart
+    fig = _reuse_figure((10, 8))
+    ax = fig.subplots()
+    
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        textprops={'fontsize': 12}
+    )
+    
+    # Enhance text appearance
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    
+    ax.set_title('Object Age Distribution', fontsize=16, fontweight='bold', pad=20)
+    
+    # Add legend with counts
+    legend_elements = [
+        mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]:,} objects")
+        for i in range(len(labels))
+    ]
+    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
+    
+    return _save_figure(fig, filename, dpi)
+
+
+def _create_region_distribution_chart(
+    filename: str, dpi: int, regions: Dict[str, int]
+) -> str:
+    """Create pie chart for bucket region distribution.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        regions: Region data
+        
+    Returns:
+        Path to saved chart file
+    """
+    labels = list(regions.keys())
+    sizes = list(regions.values())
+    colors = _colors(_TAB10_COLORS, len(labels))
+    
+    # Create chart
+    fig = _reuse_figure((10, 8))
+    ax = fig.subplots()
+    
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        textprops={'fontsize': 10}
+    )
+    
+    # Enhance text appearance
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    
+    ax.set_title('Bucket Distribution by Region', fontsize=16, fontweight='bold', pad=20)
+    
+    # Add legend with counts
+    legend_elements = [
+        mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]} buckets")
+        for i in range(len(labels))
+    ]
+    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
+    
+    return _save_figure(fig, filename, dpi)
+
+
+def _create_comprehensive_dashboard(
+    filename: str,
+    dpi: int,
+    top_buckets: List[Tuple[str, float]],
+    account_metrics: Dict[str, Any],
+    top_extensions: int,
+) -> str:
+    """Create a comprehensive dashboard with all charts combined into a single figure.
+    
+    Args:
+        filename: Path to save the chart image
+        dpi: DPI for the chart image
+        top_buckets: (bucket name, size in GB) pairs, largest first
+        account_metrics: Account-level metrics
+        top_extensions: Number of top extensions to show
+        
+    Returns:
+        Path to saved dashboard file
+    """
+    # Create a single figure with all charts
+    fig = _reuse_figure((18, 12))
+    axs = fig.subplots(2, 3)
+    
+    # File type distribution pie chart
+    if account_metrics["file_extensions"]:
+        axs[0, 0].pie(
+            [ext["count"] for ext in account_metrics["file_extensions"].values()],
+            labels=[ext for ext in account_metrics["file_extensions"]],
             autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            textprops={'fontsize': 12}
+            colors=_colors(_SET3_COLORS, len(account_metrics["file_extensions"]))
         )
-        
-        # Enhance text appearance
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        ax.set_title('Object Age Distribution', fontsize=16, fontweight='bold', pad=20)
-        
-        # Add legend with counts
-        legend_elements = [
-            mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]:,} objects")
-            for i in range(len(labels))
-        ]
-        ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        plt.tight_layout()
-        
-        # Save chart
-        filename = os.path.join(self.output_dir, "age_distribution_pie.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        axs[0, 0].set_title('File Type Distribution (by Object Count)')
     
-    def _create_region_distribution_chart(self, regions: Dict[str, int]) -> str:
-        """Create pie chart for bucket region distribution.
-        
-        Args:
-            regions: Region data
-            
-        Returns:
-            Path to saved chart file
-        """
-        labels = list(regions.keys())
-        sizes = list(regions.values())
-        colors = plt.cm.tab10(range(len(labels)))
-        
-        # Create chart
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
+    # Storage class distribution bar chart
+    if account_metrics["storage_classes"]:
+        axs[0, 1].bar(
+            account_metrics["storage_classes"].keys(),
+            [cls["count"] for cls in account_metrics["storage_classes"].values()],
+            color=_colors(_VIRIDIS_COLORS, len(account_metrics["storage_classes"]))
+        )
+        axs[0, 1].set_title('Storage Class Distribution (by Object Count)')
+    
+    # Top buckets by size bar chart
+    if top_buckets:
+        axs[0, 2].barh(
+            [name for name, _ in top_buckets],
+            [size_gb for _, size_gb in top_buckets],
+            color=_colors(_COOLWARM_COLORS, len(top_buckets))
+        )
+        axs[0, 2].set_title(f'Top {_DASHBOARD_TOP_BUCKETS} Buckets by Size')
+    
+    # Age distribution pie chart
+    if account_metrics["age_buckets"]["recent"] > 0 or account_metrics["age_buckets"]["old"] > 0:
+        axs[1, 0].pie(
+            [account_metrics["age_buckets"]["recent"], account_metrics["age_buckets"]["old"]],
+            labels=_AGE_LABELS,
             autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            textprops={'fontsize': 10}
+            colors=_AGE_COLORS
         )
-        
-        # Enhance text appearance
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        ax.set_title('Bucket Distribution by Region', fontsize=16, fontweight='bold', pad=20)
-        
-        # Add legend with counts
-        legend_elements = [
-            mpatches.Patch(color=colors[i], label=f"{labels[i]}: {sizes[i]} buckets")
-            for i in range(len(labels))
-        ]
-        ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1))
-        
-        plt.tight_layout()
-        
-        # Save chart
-        filename = os.path.join(self.output_dir, "region_distribution_pie.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        axs[1, 0].set_title('Object Age Distribution')
+    
+    # Region distribution pie chart
+    if account_metrics["regions"]:
+        axs[1, 1].pie(
+            [size for _, size in account_metrics["regions"].items()],
+            labels=[region for region, _ in account_metrics["regions"].items()],
+            autopct='%1.1f%%',
+            colors=_colors(_TAB10_COLORS, len(account_metrics["regions"]))
+        )
+        axs[1, 1].set_title('Bucket Distribution by Region')
+    
+    # Add comprehensive dashboard title
+    fig.suptitle('Comprehensive Dashboard', fontsize=18, fontweight='bold')
+    
+    return _save_figure(fig, filename, dpi)
 
-    def _create_comprehensive_dashboard(self, bucket_metrics: Dict[str, Any], account_metrics: Dict[str, Any], charts: Dict[str, str], top_extensions: int) -> str:
-        """Create a comprehensive dashboard with all charts combined into a single figure.
-        
-        Args:
-            bucket_metrics: Per-bucket metrics
-            account_metrics: Account-level metrics
-            charts: Dictionary of chart names to file paths
-            top_extensions: Number of top extensions to show
-            
-        Returns:
-            Path to saved dashboard file
-        """
-        # Create a single figure with all charts
-        fig, axs = plt.subplots(2, 3, figsize=(18, 12))
-        
-        # File type distribution pie chart
-        if account_metrics["file_extensions"]:
-            axs[0, 0].pie(
-                [ext["count"] for ext in account_metrics["file_extensions"].values()],
-                labels=[ext for ext in account_metrics["file_extensions"]],
-                autopct='%1.1f%%',
-                colors=plt.cm.Set3(range(len(account_metrics["file_extensions"])))
-            )
-            axs[0, 0].set_title('File Type Distribution (by Object Count)')
-        
-        # Storage class distribution bar chart
-        if account_metrics["storage_classes"]:
-            axs[0, 1].bar(
-                account_metrics["storage_classes"].keys(),
-                [cls["count"] for cls in account_metrics["storage_classes"].values()],
-                color=plt.cm.viridis(range(len(account_metrics["storage_classes"])))
-            )
-            axs[0, 1].set_title('Storage Class Distribution (by Object Count)')
-        
-        # Top buckets by size bar chart
-        if bucket_metrics:
-            axs[0, 2].barh(
-                [name for name, _ in sorted(bucket_metrics.items(), key=lambda x: x[1]["total_size_gb"], reverse=True)[:5]],
-                [metrics["total_size_gb"] for _, metrics in sorted(bucket_metrics.items(), key=lambda x: x[1]["total_size_gb"], reverse=True)[:5]],
-                color=plt.cm.coolwarm(range(5))
-            )
-            axs[0, 2].set_title('Top 5 Buckets by Size')
-        
-        # Age distribution pie chart
-        if account_metrics["age_buckets"]["recent"] > 0 or account_metrics["age_buckets"]["old"] > 0:
-            axs[1, 0].pie(
-                [account_metrics["age_buckets"]["recent"], account_metrics["age_buckets"]["old"]],
-                labels=['Recent (≤30 days)', 'Old (>30 days)'],
-                autopct='%1.1f%%',
-                colors=['#2ecc71', '#e74c3c']
-            )
-            axs[1, 0].set_title('Object Age Distribution')
-        
-        # Region distribution pie chart
-        if account_metrics["regions"]:
-            axs[1, 1].pie(
-                [size for _, size in account_metrics["regions"].items()],
-                labels=[region for region, _ in account_metrics["regions"].items()],
-                autopct='%1.1f%%',
-                colors=plt.cm.tab10(range(len(account_metrics["regions"])))
-            )
-            axs[1, 1].set_title('Bucket Distribution by Region')
-        
-        # Add comprehensive dashboard title
-        fig.suptitle('Comprehensive Dashboard', fontsize=18, fontweight='bold')
-        
-        plt.tight_layout()
-        
-        # Save dashboard
-        filename = os.path.join(self.output_dir, "comprehensive_dashboard.png")
-        plt.savefig(filename, dpi=self.dpi, bbox_inches='tight')
-        plt.close()
-        
-        return filename 
\ No newline at end of file
+
+def _filetype_pie_spec(file_extensions: Dict[str, Any], top_n: int) -> Dict[str, Any]:
+    """Build the Vega-Lite spec for file type distribution.
+    
+    Args:
+        file_extensions: File extension data
+        top_n: Number of top extensions to show
+        
+    Returns:
+        Vega-Lite spec
+    """
+    sorted_exts = heapq.nlargest(
+        top_n, file_extensions.items(), key=lambda x: x[1]["count"]
+    )
+    
+    return {
+        "title": "File Type Distribution (by Object Count)",
+        "data": {"values": [
+            {"extension": ext if ext != "no-extension" else "No Extension", "count": data["count"]}
+            for ext, data in sorted_exts
+        ]},
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "count", "type": "quantitative", "title": "Objects"},
+            "color": {"field": "extension", "type": "nominal", "sort": None,
+                      "scale": {"scheme": "set3"}, "title": "Extension"},
+        },
+    }
+
+
+def _storage_class_bar_spec(storage_classes: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the Vega-Lite spec for storage class distribution.
+    
+    Args:
+        storage_classes: Storage class data
+        
+    Returns:
+        Vega-Lite spec
+    """
+    values = [
+        {"storage_class": cls, "count": data["count"], "size_gb": data["size_gb"]}
+        for cls, data in storage_classes.items()
+    ]
+    
+    def bar(field: str, title: str, axis_title: str) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "mark": {"type": "bar", "tooltip": True},
+            "encoding": {
+                "x": {"field": "storage_class", "type": "nominal", "sort": None,
+                      "title": "Storage Class"},
+                "y": {"field": field, "type": "quantitative", "title": axis_title},
+            },
+        }
+    
+    return {
+        "data": {"values": values},
+        "vconcat": [
+            bar("count", "Storage Class Distribution (by Object Count)", "Number of Objects"),
+            bar("size_gb", "Storage Class Distribution (by Size)", "Size (GB)"),
+        ],
+    }
+
+
+def _top_buckets_spec(
+    top_buckets: List[Tuple[str, float]], top_n: int = TOP_BUCKETS
+) -> Dict[str, Any]:
+    """Build the Vega-Lite spec for top buckets by size.
+    
+    Args:
+        top_buckets: (bucket name, size in GB) pairs, largest first
+        top_n: Number of top buckets shown in the title
+        
+    Returns:
+        Vega-Lite spec
+    """
+    return {
+        "title": f"Top {top_n} Buckets by Size",
+        "data": {"values": [
+            {"bucket": name, "size_gb": size_gb} for name, size_gb in top_buckets
+        ]},
+        "mark": {"type": "bar", "tooltip": True},
+        "encoding": {
+            "y": {"field": "bucket", "type": "nominal", "sort": None, "title": None},
+            "x": {"field": "size_gb", "type": "quantitative", "title": "Size (GB)"},
+        },
+    }
+
+
+def _age_distribution_spec(age_buckets: Dict[str, int]) -> Dict[str, Any]:
+    """Build the Vega-Lite spec for object age distribution.
+    
+    Args:
+        age_buckets: Age bucket data
+        
+    Returns:
+        Vega-Lite spec
+    """
+    return {
+        "title": "Object Age Distribution",
+        "data": {"values": [
+            {"age": _AGE_LABELS[0], "count": age_buckets["recent"]},
+            {"age": _AGE_LABELS[1], "count": age_buckets["old"]},
+        ]},
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "count", "type": "quantitative", "title": "Objects"},
+            "color": {"field": "age", "type": "nominal", "sort": None, "title": "Age",
+                      "scale": {"domain": _AGE_LABELS, "range": _AGE_COLORS}},
+        },
+    }
+
+
+def _region_distribution_spec(regions: Dict[str, int]) -> Dict[str, Any]:
+    """Build the Vega-Lite spec for bucket region distribution.
+    
+    Args:
+        regions: Region data
+        
+    Returns:
+        Vega-Lite spec
+    """
+    return {
+        "title": "Bucket Distribution by Region",
+        "data": {"values": [
+            {"region": region, "buckets": count} for region, count in regions.items()
+        ]},
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "buckets", "type": "quantitative", "title": "Buckets"},
+            "color": {"field": "region", "type": "nominal", "sort": None,
+                      "scale": {"scheme": "tableau10"}, "title": "Region"},
+        },
+    }
+
+
+def _dashboard_spec(
+    top_buckets: List[Tuple[str, float]],
+    account_metrics: Dict[str, Any],
+    top_extensions: int,
+) -> Dict[str, Any]:
+    """Build the Vega-Lite spec combining all charts into a dashboard.
+    
+    Args:
+        top_buckets: (bucket name, size in GB) pairs, largest first
+        account_metrics: Account-level metrics
+        top_extensions: Number of top extensions to show
+        
+    Returns:
+        Vega-Lite spec
+    """
+    panels = []
+    
+    if account_metrics["file_extensions"]:
+        panels.append(_filetype_pie_spec(account_metrics["file_extensions"], top_extensions))
+    if account_metrics["storage_classes"]:
+        panels.append(_storage_class_bar_spec(account_metrics["storage_classes"]))
+    if top_buckets:
+        panels.append(_top_buckets_spec(top_buckets, _DASHBOARD_TOP_BUCKETS))
+    if account_metrics["age_buckets"]["recent"] > 0 or account_metrics["age_buckets"]["old"] > 0:
+        panels.append(_age_distribution_spec(account_metrics["age_buckets"]))
+    if account_metrics["regions"]:
+        panels.append(_region_distribution_spec(account_metrics["regions"]))
+    
+    return {
+        "title": "Comprehensive Dashboard",
+        "concat": panels,
+        "columns": 3,
+        "resolve": {"scale": {"color": "independent"}},
+    }
+
+
+# Vega-Lite spec builders by chart name; each takes the same data arguments as
+# the matching matplotlib render function
+_SPEC_BUILDERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "filetype_pie": _filetype_pie_spec,
+    "storageclass_bar": _storage_class_bar_spec,
+    "top_buckets_bar": _top_buckets_spec,
+    "age_distribution_pie": _age_distribution_spec,
+    "region_distribution_pie": _region_distribution_spec,
+    "dashboard": _dashboard_spec,
+}
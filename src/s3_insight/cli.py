@@ -2,18 +2,21 @@
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
 from rich.table import Table
 import os
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
 
 from . import __version__
 from .inventory import S3Inventory
 from .aggregate import S3Aggregator
-from .charts import ChartGenerator
 from .formats import ReportWriter
-from .publish import S3Publisher
 from .utils import get_aws_account_id
 
+# ChartGenerator is imported inside the commands that draw charts, since
+# matplotlib dominates startup; S3Publisher only where --upload needs it
+
 app = typer.Typer(
     name="s3-insight",
     help="AWS S3 bucket inventory and analytics CLI tool",
@@ -22,6 +25,37 @@ app = typer.Typer(
 console = Console()
 
 
+class _NullProgress:
+    """Stand-in for rich Progress that renders nothing."""
+    
+    def __enter__(self) -> "_NullProgress":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+    
+    def add_task(self, description: str, **kwargs: Any) -> TaskID:
+        return TaskID(0)
+    
+    def update(self, task_id: TaskID, **kwargs: Any) -> None:
+        return None
+
+
+def _progress() -> Union[Progress, _NullProgress]:
+    """Return a spinner for interactive terminals and a no-op otherwise.
+    
+    A live Progress runs a refresh thread for as long as it is open, which
+    is wasted work when output is piped or redirected.
+    """
+    if not console.is_terminal:
+        return _NullProgress()
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    )
+
+
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
@@ -42,42 +76,57 @@ def main(
 @app.command()
 def inventory(
     profile: str = typer.Option(None, "--profile", "-p", help="AWS profile to use"),
-    sample: int = typer.Option(100000, "--sample", "-s", help="Sample size for large buckets (>100M objects)"),
-    output: str = typer.Option("~/inventory.jsonl", "--output", "-o", help="Output file for raw inventory data"),
+    sample: int = typer.Option(100000, "--sample", "-s", help="Maximum object rows kept per bucket, sampled uniformly (0 keeps all)"),
+    output: str = typer.Option("~/inventory.jsonl", "--output", "-o", help="Output file for raw inventory data (gzip-compressed if it ends in .gz)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    max_parallel_listings: int = typer.Option(16, "--max-parallel-listings", min=1, help="Concurrent key-range listings per bucket"),
+    s3_inventory: bool = typer.Option(True, "--s3-inventory/--no-s3-inventory", help="Read large buckets from a recent S3 Inventory report when configured"),
+    summary_only: bool = typer.Option(False, "--summary-only", help="Record per-bucket totals only, without per-object rows"),
 ) -> None:
-    """Collect S3 bucket inventory data with optional sampling for large buckets."""
+    """Collect S3 bucket inventory data, sampling object rows for large buckets."""
     console.print(f"[bold green]🔍 Starting S3 inventory collection...[/bold green]")
     
     # Expand user path for output file
     output_path = os.path.expanduser(output)
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with _progress() as progress:
             task = progress.add_task("Initializing inventory collector...", total=None)
             
-            inventory = S3Inventory(profile=profile, sample_size=sample, verbose=verbose)
+            inventory = S3Inventory(
+                profile=profile,
+                sample_size=sample,
+                verbose=verbose,
+                max_parallel_listings=max_parallel_listings,
+                use_s3_inventory=s3_inventory,
+                summary_only=summary_only,
+            )
             progress.update(task, description="Discovering S3 buckets...")
             
             buckets = inventory.discover_buckets()
             progress.update(task, description=f"Found {len(buckets)} buckets")
             
-            progress.update(task, description="Collecting object inventory...")
-            inventory_data = inventory.collect_inventory(buckets)
+            # Write each bucket as it completes instead of holding every
+            # bucket's object list until the end; only the totals are kept
+            total_objects = 0
+            total_size = 0
             
-            progress.update(task, description="Writing inventory data...")
-            inventory.write_inventory(inventory_data, output_path)
+            def tally(
+                bucket_pairs: Iterable[Tuple[str, Dict[str, Any]]],
+            ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+                nonlocal total_objects, total_size
+                for bucket_name, bucket_data in bucket_pairs:
+                    total_objects += bucket_data["object_count"]
+                    total_size += bucket_data["total_size"]
+                    yield bucket_name, bucket_data
+            
+            progress.update(task, description="Collecting and writing object inventory...")
+            inventory.write_inventory(tally(inventory.iter_inventory(buckets)), output_path)
         
         console.print(f"[bold green]✅ Inventory collection complete![/bold green]")
         console.print(f"📊 Data written to: [bold blue]{output_path}[/bold blue]")
         
         # Summary stats
-        total_objects = sum(bucket["object_count"] for bucket in inventory_data.values())
-        total_size = sum(bucket["total_size"] for bucket in inventory_data.values())
         
         summary_table = Table(title="Inventory Summary")
         summary_table.add_column("Metric", style="cyan")
@@ -101,6 +150,7 @@ def report(
     profile: str = typer.Option(None, "--profile", "-p", help="AWS profile to use"),
     output_dir: str = typer.Option("~/reports", "--output-dir", "-o", help="Output directory for reports"),
     top_extensions: int = typer.Option(10, "--top-extensions", "-t", help="Number of top extensions to show"),
+    chart_backend: str = typer.Option("matplotlib", "--chart-backend", help="Chart backend: matplotlib (PNG) or vega-lite (JSON specs)"),
 ) -> None:
     """Generate comprehensive reports and charts from inventory data."""
     console.print(f"[bold green]📊 Generating S3 insight reports...[/bold green]")
@@ -110,34 +160,31 @@ def report(
     output_path = os.path.expanduser(output_dir)
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Loading inventory data...", total=None)
+        with _progress() as progress:
+            task = progress.add_task("Aggregating inventory data...", total=None)
             
-            # Load and aggregate data
+            # Stream the inventory file into the aggregator one bucket at a time
             inventory = S3Inventory()
-            inventory_data = inventory.load_inventory(inventory_path)
-            
-            progress.update(task, description="Aggregating metrics...")
             aggregator = S3Aggregator()
-            bucket_metrics = aggregator.aggregate_buckets(inventory_data)
+            bucket_metrics = aggregator.aggregate_buckets(
+                inventory.iter_inventory_file(inventory_path)
+            )
             account_metrics = aggregator.aggregate_account(bucket_metrics)
             
             progress.update(task, description="Generating charts...")
-            chart_gen = ChartGenerator(output_dir=os.path.join(output_path, "charts"))
+            from .charts import ChartGenerator
+            chart_gen = ChartGenerator(
+                output_dir=os.path.join(output_path, "charts"), backend=chart_backend
+            )
             charts = chart_gen.generate_charts(bucket_metrics, account_metrics, top_extensions)
             
             progress.update(task, description="Writing reports...")
-            writer = ReportWriter()
-            report_files = writer.write_reports(
-                bucket_metrics, account_metrics, charts, output_path
-            )
+            writer = ReportWriter(output_path)
+            report_files = writer.write_reports(bucket_metrics, account_metrics, charts)
             
             if upload:
                 progress.update(task, description="Uploading to S3...")
+                from .publish import S3Publisher
                 publisher = S3Publisher(profile=profile)
                 upload_urls = publisher.publish_reports(report_files)
         
@@ -177,12 +224,12 @@ def stats(
     inventory_path = os.path.expanduser(inventory_file)
     
     try:
-        # Load and aggregate data
+        # Stream the inventory file into the aggregator one bucket at a time
         inventory = S3Inventory()
-        inventory_data = inventory.load_inventory(inventory_path)
-        
         aggregator = S3Aggregator()
-        bucket_metrics = aggregator.aggregate_buckets(inventory_data)
+        bucket_metrics = aggregator.aggregate_buckets(
+            inventory.iter_inventory_file(inventory_path)
+        )
         account_metrics = aggregator.aggregate_account(bucket_metrics)
         
         # Account overview
@@ -209,20 +256,15 @@ def stats(
         top_buckets_table.add_column("Size (GB)", style="yellow")
         top_buckets_table.add_column("Avg Size (KB)", style="magenta")
         
-        sorted_buckets = sorted(
-            bucket_metrics.items(),
-            key=lambda x: x[1]["total_size"],
-            reverse=True
-        )[:top]
+        top_buckets = aggregator.get_top_buckets(bucket_metrics, top_n=top)
         
-        for i, (bucket_name, metrics) in enumerate(sorted_buckets, 1):
-            top_buckets_table.add_row(
-                str(i),
-                bucket_name,
-                f"{metrics['object_count']:,}",
-                f"{metrics['total_size_gb']:.2f}",
-                f"{metrics['avg_object_size_kb']:.2f}"
-            )
+        bucket_fields = itemgetter(
+            "bucket_name", "object_count", "total_size_gb", "avg_object_size_kb"
+        )
+        add_bucket_row = top_buckets_table.add_row
+        for i, metrics in enumerate(top_buckets, 1):
+            name, object_count, size_gb, avg_kb = bucket_fields(metrics)
+            add_bucket_row(str(i), name, f"{object_count:,}", f"{size_gb:.2f}", f"{avg_kb:.2f}")
         
         console.print(top_buckets_table)
         
@@ -235,22 +277,23 @@ def stats(
             ext_table.add_column("% Objects", style="blue")
             ext_table.add_column("% Size", style="magenta")
             
-            sorted_exts = sorted(
-                account_metrics["file_extensions"].items(),
-                key=lambda x: x[1]["count"],
-                reverse=True
-            )[:top]
+            top_exts = aggregator.get_top_extensions(account_metrics, top_n=top)
             
             total_objects = account_metrics["total_objects"]
             total_size = account_metrics["total_size"]
+            obj_pct_scale = 100.0 / total_objects if total_objects > 0 else 0
+            size_pct_scale = 100.0 / total_size if total_size > 0 else 0
             
-            for ext, data in sorted_exts:
-                ext_table.add_row(
-                    ext or "no-extension",
-                    f"{data['count']:,}",
-                    f"{data['size_gb']:.2f}",
-                    f"{data['count'] / total_objects * 100:.1f}%",
-                    f"{data['size'] / total_size * 100:.1f}%"
+            ext_fields = itemgetter("extension", "count", "size", "size_gb")
+            add_ext_row = ext_table.add_row
+            for data in top_exts:
+                extension, count, size, size_gb = ext_fields(data)
+                add_ext_row(
+                    extension or "no-extension",
+                    f"{count:,}",
+                    f"{size_gb:.2f}",
+                    f"{count * obj_pct_scale:.1f}%",
+                    f"{size * size_pct_scale:.1f}%"
                 )
             
             console.print(ext_table)
@@ -265,6 +308,7 @@ def dashboard(
     inventory_file: str = typer.Option("~/inventory.jsonl", "--input", "-i", help="Input inventory file"),
     output_dir: str = typer.Option("~/reports", "--output-dir", "-o", help="Output directory for dashboard"),
     top_extensions: int = typer.Option(10, "--top-extensions", "-t", help="Number of top extensions to show"),
+    chart_backend: str = typer.Option("matplotlib", "--chart-backend", help="Chart backend: matplotlib (PNG) or vega-lite (JSON specs)"),
 ) -> None:
     """Generate a comprehensive dashboard with all charts combined."""
     console.print(f"[bold green]📊 Generating S3 insight dashboard...[/bold green]")
@@ -274,24 +318,22 @@ def dashboard(
     output_path = os.path.expanduser(output_dir)
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Loading inventory data...", total=None)
+        with _progress() as progress:
+            task = progress.add_task("Aggregating inventory data...", total=None)
             
-            # Load and aggregate data
+            # Stream the inventory file into the aggregator one bucket at a time
             inventory = S3Inventory()
-            inventory_data = inventory.load_inventory(inventory_path)
-            
-            progress.update(task, description="Aggregating metrics...")
             aggregator = S3Aggregator()
-            bucket_metrics = aggregator.aggregate_buckets(inventory_data)
+            bucket_metrics = aggregator.aggregate_buckets(
+                inventory.iter_inventory_file(inventory_path)
+            )
             account_metrics = aggregator.aggregate_account(bucket_metrics)
             
             progress.update(task, description="Generating dashboard...")
-            chart_gen = ChartGenerator(output_dir=os.path.join(output_path, "charts"))
+            from .charts import ChartGenerator
+            chart_gen = ChartGenerator(
+                output_dir=os.path.join(output_path, "charts"), backend=chart_backend
+            )
             charts = chart_gen.generate_charts(bucket_metrics, account_metrics, top_extensions)
             
             # Get the dashboard file
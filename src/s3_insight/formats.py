@@ -3,9 +3,41 @@
 import csv
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from itertools import islice
 from typing import Any, Dict, List
 
+from .aggregate import dumps_metrics
+
+# Column order of the per-bucket CSV report
+_CSV_FIELDNAMES = (
+    'bucket_name',
+    'region',
+    'object_count',
+    'total_size_bytes',
+    'total_size_gb',
+    'total_size_tb',
+    'avg_object_size_bytes',
+    'avg_object_size_kb',
+    'sampled',
+    'sample_size',
+    'storage_classes',
+    'top_extensions',
+    'recent_objects',
+    'old_objects',
+    'recent_percentage',
+    'old_percentage',
+    'inventory_date',
+)
+
+_CHART_TITLE_MAP = {
+    "filetype_pie": "File Type Distribution",
+    "storageclass_bar": "Storage Class Distribution",
+    "top_buckets_bar": "Top Buckets by Size",
+    "age_distribution_pie": "Object Age Distribution",
+    "region_distribution_pie": "Bucket Distribution by Region"
+}
+
 
 class ReportWriter:
     """Writes S3 inventory reports in various formats."""
@@ -37,21 +69,24 @@ class ReportWriter:
         Returns:
             Dictionary mapping report types to file paths
         """
-        if output_dir:
+        if output_dir and output_dir != self.output_dir:
             self.output_dir = output_dir
             os.makedirs(output_dir, exist_ok=True)
         
         report_files = {}
         
+        # Stamp every report with the same generation time
+        generated_at = datetime.now(timezone.utc)
+        
         # Write CSV report
         report_files["csv"] = self._write_csv_report(bucket_metrics)
         
         # Write JSON report
-        report_files["json"] = self._write_json_report(account_metrics)
+        report_files["json"] = self._write_json_report(account_metrics, generated_at)
         
         # Write Markdown report
         report_files["markdown"] = self._write_markdown_report(
-            bucket_metrics, account_metrics, charts
+            bucket_metrics, account_metrics, charts, generated_at
         )
         
         return report_files
@@ -68,58 +103,46 @@ class ReportWriter:
         filename = os.path.join(self.output_dir, "report-buckets.csv")
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'bucket_name',
-                'region',
-                'object_count',
-                'total_size_bytes',
-                'total_size_gb',
-                'total_size_tb',
-                'avg_object_size_bytes',
-                'avg_object_size_kb',
-                'sampled',
-                'sample_size',
-                'storage_classes',
-                'top_extensions',
-                'recent_objects',
-                'old_objects',
-                'recent_percentage',
-                'old_percentage',
-                'inventory_date'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(_CSV_FIELDNAMES)
             
-            for bucket_name, metrics in bucket_metrics.items():
-                row = {
-                    'bucket_name': bucket_name,
-                    'region': metrics['region'],
-                    'object_count': metrics['object_count'],
-                    'total_size_bytes': metrics['total_size'],
-                    'total_size_gb': f"{metrics['total_size_gb']:.2f}",
-                    'total_size_tb': f"{metrics['total_size_tb']:.3f}",
-                    'avg_object_size_bytes': metrics['avg_object_size'],
-                    'avg_object_size_kb': f"{metrics['avg_object_size_kb']:.2f}",
-                    'sampled': metrics['sampled'],
-                    'sample_size': metrics['sample_size'],
-                    'storage_classes': json.dumps(metrics['storage_classes']),
-                    'top_extensions': json.dumps(dict(list(metrics['file_extensions'].items())[:5])),
-                    'recent_objects': metrics['age_buckets']['recent'],
-                    'old_objects': metrics['age_buckets']['old'],
-                    'recent_percentage': f"{metrics['age_breakdown']['recent']['percentage']:.1f}",
-                    'old_percentage': f"{metrics['age_breakdown']['old']['percentage']:.1f}",
-                    'inventory_date': metrics['inventory_date']
-                }
-                writer.writerow(row)
+            # Rows are plain tuples in _CSV_FIELDNAMES order; csv.writer skips
+            # the per-row dict lookups DictWriter does for every field
+            writer.writerows(
+                (
+                    bucket_name,
+                    metrics['region'],
+                    metrics['object_count'],
+                    metrics['total_size'],
+                    f"{metrics['total_size_gb']:.2f}",
+                    f"{metrics['total_size_tb']:.3f}",
+                    metrics['avg_object_size'],
+                    f"{metrics['avg_object_size_kb']:.2f}",
+                    metrics['sampled'],
+                    metrics['sample_size'],
+                    json.dumps(metrics['storage_classes']),
+                    json.dumps(dict(islice(metrics['file_extensions'].items(), 5))),
+                    metrics['age_buckets']['recent'],
+                    metrics['age_buckets']['old'],
+                    f"{metrics['age_breakdown']['recent']['percentage']:.1f}",
+                    f"{metrics['age_breakdown']['old']['percentage']:.1f}",
+                    metrics['inventory_date'],
+                )
+                for bucket_name, metrics in bucket_metrics.items()
+            )
         
         return filename
     
-    def _write_json_report(self, account_metrics: Dict[str, Any]) -> str:
+    def _write_json_report(
+        self,
+        account_metrics: Dict[str, Any],
+        generated_at: datetime
+    ) -> str:
         """Write account metrics to JSON file.
         
         Args:
             account_metrics: Account-level metrics
+            generated_at: Report generation time (UTC)
             
         Returns:
             Path to JSON file
@@ -129,15 +152,15 @@ class ReportWriter:
         # Add report metadata
         report_data = {
             "report_metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at.isoformat(),
                 "tool_version": "s3-insight-0.1.0",
                 "report_type": "account_summary"
             },
             "account_metrics": account_metrics
         }
         
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(report_data, jsonfile, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as jsonfile:
+            jsonfile.write(dumps_metrics(report_data, indent=True))
         
         return filename
     
@@ -145,7 +168,8 @@ class ReportWriter:
         self,
         bucket_metrics: Dict[str, Any],
         account_metrics: Dict[str, Any],
-        charts: Dict[str, str]
+        charts: Dict[str, str],
+        generated_at: datetime
     ) -> str:
         """Write comprehensive Markdown report.
         
@@ -153,132 +177,146 @@ class ReportWriter:
             bucket_metrics: Per-bucket metrics
             account_metrics: Account-level metrics
             charts: Dictionary of chart file paths
+            generated_at: Report generation time (UTC)
             
         Returns:
             Path to Markdown file
         """
         filename = os.path.join(self.output_dir, "report.md")
         
-        with open(filename, 'w', encoding='utf-8') as mdfile:
-            # Header
-            mdfile.write("# S3 Inventory Report\n\n")
-            mdfile.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
-            mdfile.write(f"**Tool Version:** s3-insight-0.1.0\n\n")
-            
-            # Executive Summary
-            mdfile.write("## Executive Summary\n\n")
-            mdfile.write(f"- **Total Buckets:** {account_metrics['bucket_count']:,}\n")
-            mdfile.write(f"- **Total Objects:** {account_metrics['total_objects']:,}\n")
-            mdfile.write(f"- **Total Size:** {account_metrics['total_size_gb']:.2f} GB ({account_metrics['total_size_tb']:.3f} TB)\n")
-            mdfile.write(f"- **Average Object Size:** {account_metrics['avg_object_size_kb']:.2f} KB\n")
-            if account_metrics['sampled_buckets'] > 0:
-                mdfile.write(f"- **Sampled Buckets:** {account_metrics['sampled_buckets']} (large buckets >100M objects)\n")
-            mdfile.write("\n")
-            
-            # Charts section
-            if charts:
-                mdfile.write("## Visualizations\n\n")
-                for chart_name, chart_path in charts.items():
-                    chart_filename = os.path.basename(chart_path)
-                    mdfile.write(f"### {self._format_chart_title(chart_name)}\n\n")
-                    mdfile.write(f"![{chart_name}]({chart_filename})\n\n")
-            
-            # Account-level metrics
-            mdfile.write("## Account-Level Metrics\n\n")
-            
-            # Storage classes
-            if account_metrics['storage_classes']:
-                mdfile.write("### Storage Class Distribution\n\n")
-                mdfile.write("| Storage Class | Objects | Size (GB) | % Objects | % Size |\n")
-                mdfile.write("|---------------|---------|-----------|-----------|--------|\n")
-                
-                total_objects = account_metrics['total_objects']
-                total_size = account_metrics['total_size']
-                
-                for storage_class, data in account_metrics['storage_classes'].items():
-                    obj_pct = (data['count'] / total_objects * 100) if total_objects > 0 else 0
-                    size_pct = (data['size'] / total_size * 100) if total_size > 0 else 0
-                    mdfile.write(
-                        f"| {storage_class} | {data['count']:,} | {data['size_gb']:.2f} | "
-                        f"{obj_pct:.1f}% | {size_pct:.1f}% |\n"
-                    )
-                mdfile.write("\n")
-            
-            # File extensions
-            if account_metrics['file_extensions']:
-                mdfile.write("### Top File Extensions\n\n")
-                mdfile.write("| Extension | Objects | Size (GB) | % Objects | % Size |\n")
-                mdfile.write("|-----------|---------|-----------|-----------|--------|\n")
-                
-                top_extensions = list(account_metrics['file_extensions'].items())[:10]
-                for ext, data in top_extensions:
-                    ext_name = ext if ext != "no-extension" else "No Extension"
-                    obj_pct = (data['count'] / total_objects * 100) if total_objects > 0 else 0
-                    size_pct = (data['size'] / total_size * 100) if total_size > 0 else 0
-                    mdfile.write(
-                        f"| {ext_name} | {data['count']:,} | {data['size_gb']:.2f} | "
-                        f"{obj_pct:.1f}% | {size_pct:.1f}% |\n"
-                    )
-                mdfile.write("\n")
-            
-            # Age distribution
-            if account_metrics['age_buckets']['recent'] > 0 or account_metrics['age_buckets']['old'] > 0:
-                mdfile.write("### Object Age Distribution\n\n")
-                mdfile.write("| Age Category | Objects | Percentage |\n")
-                mdfile.write("|--------------|---------|------------|\n")
-                
-                recent = account_metrics['age_buckets']['recent']
-                old = account_metrics['age_buckets']['old']
-                total_age_objects = recent + old
-                
-                if total_age_objects > 0:
-                    recent_pct = (recent / total_age_objects * 100)
-                    old_pct = (old / total_age_objects * 100)
-                    mdfile.write(f"| Recent (≤30 days) | {recent:,} | {recent_pct:.1f}% |\n")
-                    mdfile.write(f"| Old (>30 days) | {old:,} | {old_pct:.1f}% |\n")
-                mdfile.write("\n")
-            
-            # Region distribution
-            if account_metrics['regions']:
-                mdfile.write("### Bucket Distribution by Region\n\n")
-                mdfile.write("| Region | Buckets | Percentage |\n")
-                mdfile.write("|--------|---------|------------|\n")
-                
-                total_buckets = account_metrics['bucket_count']
-                for region, count in account_metrics['regions'].items():
-                    pct = (count / total_buckets * 100) if total_buckets > 0 else 0
-                    mdfile.write(f"| {region} | {count} | {pct:.1f}% |\n")
-                mdfile.write("\n")
+        # Collect the report in memory and write it with a single call
+        parts: List[str] = []
+        append = parts.append
+        
+        # Header
+        append("# S3 Inventory Report\n\n")
+        append(f"**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+        append(f"**Tool Version:** s3-insight-0.1.0\n\n")
+        
+        # Executive Summary
+        append("## Executive Summary\n\n")
+        append(f"- **Total Buckets:** {account_metrics['bucket_count']:,}\n")
+        append(f"- **Total Objects:** {account_metrics['total_objects']:,}\n")
+        append(f"- **Total Size:** {account_metrics['total_size_gb']:.2f} GB ({account_metrics['total_size_tb']:.3f} TB)\n")
+        append(f"- **Average Object Size:** {account_metrics['avg_object_size_kb']:.2f} KB\n")
+        if account_metrics['sampled_buckets'] > 0:
+            append(f"- **Sampled Buckets:** {account_metrics['sampled_buckets']} (object rows sampled; totals cover every object)\n")
+        append("\n")
+        
+        # Charts section
+        if charts:
+            append("## Visualizations\n\n")
+            for chart_name, chart_path in charts.items():
+                chart_filename = os.path.basename(chart_path)
+                append(f"### {self._format_chart_title(chart_name)}\n\n")
+                if chart_filename.endswith(".png"):
+                    append(f"![{chart_name}]({chart_filename})\n\n")
+                else:
+                    # Vega-Lite specs are rendered by the viewer, so link them
+                    append(f"[{chart_name}]({chart_filename})\n\n")
+        
+        # Account-level metrics
+        append("## Account-Level Metrics\n\n")
+        
+        # Percentage scale factors, computed once for every table row
+        total_objects = account_metrics['total_objects']
+        total_size = account_metrics['total_size']
+        obj_pct_scale = 100.0 / total_objects if total_objects > 0 else 0
+        size_pct_scale = 100.0 / total_size if total_size > 0 else 0
+        
+        # Storage classes
+        if account_metrics['storage_classes']:
+            append("### Storage Class Distribution\n\n")
+            append("| Storage Class | Objects | Size (GB) | % Objects | % Size |\n")
+            append("|---------------|---------|-----------|-----------|--------|\n")
             
-            # Per-bucket details
-            mdfile.write("## Per-Bucket Details\n\n")
-            mdfile.write("| Bucket | Region | Objects | Size (GB) | Avg Size (KB) | Storage Classes |\n")
-            mdfile.write("|--------|--------|---------|-----------|---------------|-----------------|\n")
+            append("".join([
+                f"| {storage_class} | {data['count']:,} | {data['size_gb']:.2f} | "
+                f"{data['count'] * obj_pct_scale:.1f}% | "
+                f"{data['size'] * size_pct_scale:.1f}% |\n"
+                for storage_class, data in account_metrics['storage_classes'].items()
+            ]))
+            append("\n")
+        
+        # File extensions
+        if account_metrics['file_extensions']:
+            append("### Top File Extensions\n\n")
+            append("| Extension | Objects | Size (GB) | % Objects | % Size |\n")
+            append("|-----------|---------|-----------|-----------|--------|\n")
             
-            # Sort buckets by size
-            sorted_buckets = sorted(
-                bucket_metrics.items(),
-                key=lambda x: x[1]['total_size'],
-                reverse=True
-            )
+            top_extensions = islice(account_metrics['file_extensions'].items(), 10)
+            append("".join([
+                f"| {ext if ext != 'no-extension' else 'No Extension'} | "
+                f"{data['count']:,} | {data['size_gb']:.2f} | "
+                f"{data['count'] * obj_pct_scale:.1f}% | "
+                f"{data['size'] * size_pct_scale:.1f}% |\n"
+                for ext, data in top_extensions
+            ]))
+            append("\n")
+        
+        # Age distribution
+        if account_metrics['age_buckets']['recent'] > 0 or account_metrics['age_buckets']['old'] > 0:
+            append("### Object Age Distribution\n\n")
+            append("| Age Category | Objects | Percentage |\n")
+            append("|--------------|---------|------------|\n")
             
-            for bucket_name, metrics in sorted_buckets:
-                storage_classes_str = ", ".join(metrics['storage_classes'].keys())
-                mdfile.write(
-                    f"| {bucket_name} | {metrics['region']} | {metrics['object_count']:,} | "
-                    f"{metrics['total_size_gb']:.2f} | {metrics['avg_object_size_kb']:.2f} | "
-                    f"{storage_classes_str} |\n"
-                )
+            recent = account_metrics['age_buckets']['recent']
+            old = account_metrics['age_buckets']['old']
+            total_age_objects = recent + old
             
-            mdfile.write("\n")
+            if total_age_objects > 0:
+                recent_pct = (recent / total_age_objects * 100)
+                old_pct = (old / total_age_objects * 100)
+                append(f"| Recent (≤30 days) | {recent:,} | {recent_pct:.1f}% |\n")
+                append(f"| Old (>30 days) | {old:,} | {old_pct:.1f}% |\n")
+            append("\n")
+        
+        # Region distribution
+        if account_metrics['regions']:
+            append("### Bucket Distribution by Region\n\n")
+            append("| Region | Buckets | Percentage |\n")
+            append("|--------|---------|------------|\n")
             
-            # Footer
-            mdfile.write("---\n\n")
-            mdfile.write("*Report generated by S3-Insight*\n")
+            total_buckets = account_metrics['bucket_count']
+            bucket_pct_scale = 100.0 / total_buckets if total_buckets > 0 else 0
+            append("".join([
+                f"| {region} | {count} | {count * bucket_pct_scale:.1f}% |\n"
+                for region, count in account_metrics['regions'].items()
+            ]))
+            append("\n")
+        
+        # Per-bucket details
+        append("## Per-Bucket Details\n\n")
+        append("| Bucket | Region | Objects | Size (GB) | Avg Size (KB) | Storage Classes |\n")
+        append("|--------|--------|---------|-----------|---------------|-----------------|\n")
+        
+        # Sort buckets by size
+        sorted_buckets = sorted(
+            bucket_metrics.items(),
+            key=lambda x: x[1]['total_size'],
+            reverse=True
+        )
+        
+        append("".join([
+            f"| {bucket_name} | {metrics['region']} | {metrics['object_count']:,} | "
+            f"{metrics['total_size_gb']:.2f} | {metrics['avg_object_size_kb']:.2f} | "
+            f"{', '.join(metrics['storage_classes'])} |\n"
+            for bucket_name, metrics in sorted_buckets
+        ]))
+        
+        append("\n")
+        
+        # Footer
+        append("---\n\n")
+        append("*Report generated by S3-Insight*\n")
+        
+        with open(filename, 'w', encoding='utf-8') as mdfile:
+            mdfile.write(''.join(parts))
         
         return filename
     
-    def _format_chart_title(self, chart_name: str) -> str:
+    @staticmethod
+    def _format_chart_title(chart_name: str) -> str:
         """Format chart name for display.
         
         Args:
@@ -287,12 +325,7 @@ class ReportWriter:
         Returns:
             Formatted chart title
         """
-        title_map = {
-            "filetype_pie": "File Type Distribution",
-            "storageclass_bar": "Storage Class Distribution",
-            "top_buckets_bar": "Top Buckets by Size",
-            "age_distribution_pie": "Object Age Distribution",
-            "region_distribution_pie": "Bucket Distribution by Region"
-        }
-        
-        return title_map.get(chart_name, chart_name.replace('_', ' ').title()) 
\ No newline at end of file
+        title = _CHART_TITLE_MAP.get(chart_name)
+        if title is None:
+            title = chart_name.replace('_', ' ').title()
+        return title 
\ No newline at end of file
@@ -1,16 +1,161 @@
 """S3 bucket inventory collection module."""
 
-import json
+import gzip
+import math
+import mmap
 import os
-import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import random
+import re
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union, cast
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+# GetBucketLocation is a small round trip, so far more lookups can be in
+# flight at once than full bucket listings
+REGION_LOOKUP_WORKERS = 32
+
+# Listings larger than one page are split into key ranges at these
+# boundaries and listed concurrently. S3 rate-limits LIST per prefix, so
+# separate ranges scale close to linearly. Sorted by code point, which
+# matches the UTF-8 order S3 lists keys in.
+LIST_SHARD_BOUNDARIES = tuple(sorted(
+    '/0123456789'
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    'abcdefghijklmnopqrstuvwxyz'
+))
+LIST_SHARD_WORKERS = 16  # default for max_parallel_listings
+
+# Pages each shard may list ahead of the consumer; shards are read in key
+# order, so later ones wait here instead of holding their whole range
+LIST_SHARD_QUEUE_PAGES = 4
+
+# Shard listing pages, ended by None
+_PageQueue = queue.Queue[Optional[List[Dict[str, Any]]]]
+
+# Buckets with more objects than this stop listing one object past it;
+# per-object records are capped separately by sample_size
+SAMPLING_THRESHOLD = 100_000_000
+
+# Buckets larger than one listing page are read from their S3 Inventory
+# report instead of being listed, if a complete report this recent exists
+S3_INVENTORY_MAX_AGE = timedelta(days=2)
+
+# Each S3 Inventory run is delivered under a YYYY-MM-DDTHH-MMZ/ prefix, next
+# to the data/ and hive/ prefixes of the same configuration
+S3_INVENTORY_RUN_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}-\d{2}Z/')
+
+# S3 Inventory optional fields needed to fill in a bucket's tallies
+S3_INVENTORY_REQUIRED_FIELDS = frozenset({"Size", "LastModifiedDate", "StorageClass"})
+
+# Listing fields and the matching S3 Inventory columns in each report format
+S3_INVENTORY_COLUMNS = {
+    "CSV": {
+        "Key": "Key",
+        "Size": "Size",
+        "LastModified": "LastModifiedDate",
+        "StorageClass": "StorageClass",
+        "ETag": "ETag",
+    },
+    "Parquet": {
+        "Key": "key",
+        "Size": "size",
+        "LastModified": "last_modified_date",
+        "StorageClass": "storage_class",
+        "ETag": "e_tag",
+    },
+}
+
+# Per-bucket S3 errors recorded as an inventory entry instead of raised,
+# by error code; these mean the bucket cannot be listed, not a failed run
+BUCKET_ERROR_MESSAGES = {
+    "AccessDenied": "Access denied",
+    "AllAccessDisabled": "All access disabled",
+    "NoSuchBucket": "Bucket no longer exists",
+}
+
+# Encoded inventory lines are batched up to this many bytes per write()
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Inventory files named *.gz are gzip-compressed at this level; the JSONL
+# repeats the same keys on every object, so even level 1 shrinks it several
+# times over at a small CPU cost
+INVENTORY_GZIP_LEVEL = 1
+
+
+def _open_inventory(path: str, mode: str) -> IO[bytes]:
+    """Open an inventory file in binary mode, through gzip if it ends in .gz."""
+    if path.endswith('.gz'):
+        return cast(IO[bytes], gzip.open(path, mode, compresslevel=INVENTORY_GZIP_LEVEL))
+    return open(path, mode)
+
+
+def _put_page(
+    pages: _PageQueue,
+    page: Optional[List[Dict[str, Any]]],
+    stop: threading.Event,
+) -> bool:
+    """Put a listing page on a shard's queue, giving up once stop is set.
+    
+    Returns:
+        True if the page was queued, False if listing was stopped
+    """
+    while not stop.is_set():
+        try:
+            pages.put(page, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _Reservoir:
+    """Uniform fixed-size sample over a stream of listing pages.
+    
+    Uses Li's Algorithm L: once the reservoir is full, the gap to the next
+    replacement is drawn directly, so the cost grows with the number of
+    replacements (about size * ln(seen / size)) rather than with every
+    object seen. A size of 0 or less keeps every item.
+    """
+    
+    def __init__(self, size: int, rng: Optional[random.Random] = None) -> None:
+        self.size = size
+        self.items: List[Any] = []
+        self.seen = 0
+        self._rng = rng or random.Random()
+        self._weight = 1.0
+        self._next = size - 1
+        if size > 0:
+            self._advance()
+    
+    def _advance(self) -> None:
+        """Draw the stream index of the next item to keep."""
+        rng = self._rng
+        self._weight *= math.exp(math.log(1.0 - rng.random()) / self.size)
+        self._next += int(math.log(1.0 - rng.random()) / math.log1p(-self._weight)) + 1
+    
+    def extend(self, page: List[Any], to_item: Callable[[Any], Any]) -> None:
+        """Offer a page to the sample; `to_item` is called only on kept entries."""
+        start = self.seen
+        end = start + len(page)
+        self.seen = end
+        size = self.size
+        if size <= 0:
+            self.items.extend(map(to_item, page))
+            return
+        if start < size:
+            self.items.extend(map(to_item, page[:size - start]))
+        while self._next < end:
+            self.items[self._rng.randrange(size)] = to_item(page[self._next - start])
+            self._advance()
+
 
 class S3Inventory:
     """Handles S3 bucket discovery and object inventory collection."""
@@ -21,20 +166,42 @@ class S3Inventory:
         sample_size: int = 100000,
         verbose: bool = False,
         max_workers: int = 10,
+        max_parallel_listings: int = LIST_SHARD_WORKERS,
+        use_s3_inventory: bool = True,
+        summary_only: bool = False,
     ) -> None:
         """Initialize the S3 inventory collector.
         
         Args:
             profile: AWS profile to use
-            sample_size: Number of objects to sample for large buckets (>100M objects)
+            sample_size: Maximum per-object records kept per bucket, drawn as a
+                uniform sample when a bucket has more objects (0 keeps all)
             verbose: Enable verbose logging
             max_workers: Maximum number of concurrent workers
+            max_parallel_listings: Maximum concurrent key-range listings per
+                bucket (1 lists each bucket serially)
+            use_s3_inventory: Read large buckets from a recent S3 Inventory
+                report when one is configured, instead of listing them
+            summary_only: Keep only per-bucket tallies and no per-object
+                records; every object is still counted
         """
         self.profile = profile
         self.sample_size = sample_size
         self.verbose = verbose
         self.max_workers = max_workers
+        self.max_parallel_listings = max(1, max_parallel_listings)
+        self.use_s3_inventory = use_s3_inventory
+        self.summary_only = summary_only
         self.session = self._create_session()
+        self._buckets: Optional[List[str]] = None
+        self._bucket_regions: Dict[str, str] = {}
+        self._clients: Dict[Optional[str], Any] = {}
+        self._client_lock = threading.Lock()
+        # Size each shared client's connection pool for every thread that
+        # may use it at once (botocore defaults to 10)
+        self._client_config = Config(max_pool_connections=max(
+            REGION_LOOKUP_WORKERS, self.max_workers * self.max_parallel_listings
+        ))
         
     def _create_session(self) -> boto3.Session:
         """Create boto3 session with profile if specified."""
@@ -42,21 +209,80 @@ class S3Inventory:
             return boto3.Session(profile_name=self.profile)
         return boto3.Session()
     
+    def _client(self, region: Optional[str] = None) -> Any:
+        """Return the S3 client for a region, shared by all worker threads.
+        
+        botocore clients are thread-safe once built, so one client per region
+        serves every thread. Creating clients from a shared session is not
+        thread-safe, so that happens under a lock.
+        """
+        client = self._clients.get(region)
+        if client is None:
+            with self._client_lock:
+                client = self._clients.get(region)
+                if client is None:
+                    client = self.session.client(
+                        's3', region_name=region, config=self._client_config
+                    )
+                    self._clients[region] = client
+        return client
+    
+    def _lookup_region(self, bucket_name: str) -> str:
+        """Resolve the region of a bucket, defaulting to us-east-1.
+        
+        Results are cached on the instance, so each bucket costs at most one
+        lookup per run.
+        """
+        region = self._bucket_regions.get(bucket_name)
+        if region is not None:
+            return region
+        
+        client = self._client()
+        try:
+            location_response = client.get_bucket_location(Bucket=bucket_name)
+            region = location_response.get('LocationConstraint') or 'us-east-1'
+        except ClientError:
+            # GetBucketLocation needs permissions that HeadBucket doesn't;
+            # S3 reports the region in a header even when HEAD is denied
+            try:
+                headers = client.head_bucket(Bucket=bucket_name)['ResponseMetadata']['HTTPHeaders']
+            except ClientError as e:
+                headers = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+            region = headers.get('x-amz-bucket-region') or 'us-east-1'
+        
+        self._bucket_regions[bucket_name] = region
+        return region
+    
     def discover_buckets(self) -> List[str]:
         """Discover all S3 buckets in the account.
         
+        The bucket list is fetched once per instance; later calls return a
+        copy of it without another ListBuckets round trip.
+        
         Returns:
             List of bucket names
         """
+        if self._buckets is not None:
+            return list(self._buckets)
+        
         try:
-            s3_client = self.session.client('s3')
-            response = s3_client.list_buckets()
+            response = self._client().list_buckets()
             buckets = [bucket['Name'] for bucket in response['Buckets']]
             
             if self.verbose:
                 print(f"Discovered {len(buckets)} buckets")
-                
-            return buckets
+            
+            # Resolve bucket regions concurrently up front so the inventory
+            # workers don't each pay for a serial GetBucketLocation call
+            if buckets:
+                with ThreadPoolExecutor(
+                    max_workers=min(REGION_LOOKUP_WORKERS, len(buckets))
+                ) as executor:
+                    # Drain the results so lookup errors surface here
+                    list(executor.map(self._lookup_region, buckets))
+            
+            self._buckets = buckets
+            return list(buckets)
             
         except (NoCredentialsError, ClientError) as e:
             raise RuntimeError(f"Failed to discover buckets: {e}")
@@ -70,8 +296,17 @@ class S3Inventory:
         Returns:
             Dictionary with bucket inventory data
         """
-        inventory_data = {}
+        return dict(self.iter_inventory(buckets))
+    
+    def iter_inventory(self, buckets: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Collect inventory data for all buckets, yielding each as it completes.
         
+        Args:
+            buckets: List of bucket names to inventory
+            
+        Yields:
+            Tuples of (bucket_name, bucket_data)
+        """
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit inventory tasks for all buckets
             future_to_bucket = {
@@ -79,12 +314,11 @@ class S3Inventory:
                 for bucket in buckets
             }
             
-            # Collect results as they complete
+            # Yield results as they complete
             for future in as_completed(future_to_bucket):
                 bucket = future_to_bucket[future]
                 try:
                     bucket_data = future.result()
-                    inventory_data[bucket] = bucket_data
                     
                     if self.verbose:
                         print(f"Completed inventory for {bucket}: {bucket_data['object_count']} objects")
@@ -92,7 +326,7 @@ class S3Inventory:
                 except Exception as e:
                     print(f"Error inventorying bucket {bucket}: {e}")
                     # Create a minimal bucket entry with error info
-                    inventory_data[bucket] = {
+                    bucket_data = {
                         "bucket_name": bucket,
                         "error": str(e),
                         "object_count": 0,
@@ -106,8 +340,8 @@ class S3Inventory:
                         "objects": [],
                         "inventory_date": datetime.now().isoformat(),
                     }
-        
-        return inventory_data
+                
+                yield bucket, bucket_data
     
     def _inventory_bucket(self, bucket_name: str) -> Dict[str, Any]:
         """Collect inventory data for a single bucket.
@@ -119,131 +353,369 @@ class S3Inventory:
             Dictionary with bucket inventory data
         """
         try:
-            s3_client = self.session.client('s3')
-            
-            # Get bucket location
-            try:
-                location_response = s3_client.get_bucket_location(Bucket=bucket_name)
-                region = location_response.get('LocationConstraint') or 'us-east-1'
-            except ClientError:
-                region = 'us-east-1'
+            # Usually already resolved and cached during discovery
+            region = self._lookup_region(bucket_name)
             
             # Create regional client
-            regional_client = self.session.client('s3', region_name=region)
+            regional_client = self._client(region)
             
-            objects = []
+            sample = _Reservoir(self.sample_size)
             object_count = 0
             total_size = 0
-            storage_classes = {}
-            file_extensions = {}
-            age_buckets = {
-                "recent": 0,  # ≤ 30 days
-                "old": 0,     # > 30 days
-            }
+            storage_classes: Counter = Counter()
+            # Extension counts and sizes are kept apart so counting is a
+            # single C-level Counter.update per page
+            extension_counts: Counter = Counter()
+            extension_sizes: Dict[str, int] = defaultdict(int)
+            recent = 0
             
-            thirty_days_ago = datetime.utcnow().replace(tzinfo=timezone.utc) - timedelta(days=30)
+            thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+            get_extension = self._get_file_extension
             
-            # Use AWS CLI for better performance with large buckets
-            paginator = regional_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(
-                Bucket=bucket_name,
-                PaginationConfig={'PageSize': 1000}
-            )
-            
-            for page in page_iterator:
-                if 'Contents' not in page:
+            for contents in self._iter_object_listing(bucket_name, region, regional_client):
+                # Stop one object past the sampling threshold
+                if not self.summary_only:
+                    remaining = SAMPLING_THRESHOLD + 1 - object_count
+                    if len(contents) > remaining:
+                        contents = contents[:remaining]
+                if not contents:
                     continue
-                    
-                for obj in page['Contents']:
-                    object_count += 1
-                    total_size += obj['Size']
-                    
-                    # Track storage class
-                    storage_class = obj.get('StorageClass', 'STANDARD')
-                    storage_classes[storage_class] = storage_classes.get(storage_class, 0) + 1
-                    
-                    # Track file extension
-                    key = obj['Key']
-                    extension = self._get_file_extension(key)
-                    if extension not in file_extensions:
-                        file_extensions[extension] = {"count": 0, "size": 0}
-                    file_extensions[extension]["count"] += 1
-                    file_extensions[extension]["size"] += obj['Size']
-                    
-                    # Track age - ensure both datetimes are timezone-aware
-                    last_modified = obj['LastModified']
-                    
-                    # Convert both to UTC for comparison
-                    if last_modified.tzinfo is None:
-                        # If last_modified is naive, assume it's UTC
-                        last_modified_utc = last_modified.replace(tzinfo=timezone.utc)
-                    else:
-                        # If it's already timezone-aware, convert to UTC
-                        last_modified_utc = last_modified.astimezone(timezone.utc)
-                    
-                    try:
-                        if last_modified_utc > thirty_days_ago:
-                            age_buckets["recent"] += 1
-                        else:
-                            age_buckets["old"] += 1
-                    except Exception as e:
-                        # If there's still a timezone issue, skip age tracking for this object
-                        if self.verbose:
-                            print(f"Warning: Could not determine age for object {key}: {e}")
-                        # Default to old if we can't determine
-                        age_buckets["old"] += 1
-                    
-                    # Store object data (with sampling for large buckets)
-                    if object_count <= self.sample_size or object_count <= 100000000:
-                        objects.append({
-                            "key": key,
-                            "size": obj['Size'],
-                            "last_modified": last_modified.isoformat(),
-                            "storage_class": storage_class,
-                            "etag": obj.get('ETag', ''),
-                        })
-                    
-                    # Apply sampling for very large buckets
-                    if object_count > 100000000 and len(objects) >= self.sample_size:
-                        break
                 
-                # Break if we've sampled enough
-                if object_count > 100000000 and len(objects) >= self.sample_size:
+                # Split the page into columns once, then tally each column
+                # with builtins that loop in C instead of per-object bytecode
+                sizes = [obj['Size'] for obj in contents]
+                page_classes = [obj.get('StorageClass', 'STANDARD') for obj in contents]
+                page_extensions = list(map(get_extension, [obj['Key'] for obj in contents]))
+                last_modified = [
+                    # Listings are timezone-aware; treat naive datetimes as UTC
+                    lm if lm.tzinfo is not None else lm.replace(tzinfo=timezone.utc)
+                    for lm in (obj['LastModified'] for obj in contents)
+                ]
+                
+                total_size += sum(sizes)
+                storage_classes.update(page_classes)
+                recent += sum(map(thirty_days_ago.__lt__, last_modified))
+                
+                extension_counts.update(page_extensions)
+                for extension, size in zip(page_extensions, sizes):
+                    extension_sizes[extension] += size
+                
+                # Keep a bounded uniform sample of per-object records
+                if not self.summary_only:
+                    sample.extend(contents, self._object_record)
+                
+                object_count += len(contents)
+                
+                # Stop listing very large buckets; summaries count every
+                # object
+                if not self.summary_only and object_count > SAMPLING_THRESHOLD:
                     break
             
-            # Convert file extensions to sorted list
-            sorted_extensions = sorted(
-                file_extensions.items(),
-                key=lambda x: x[1]["count"],
-                reverse=True
-            )
+            objects = sample.items
+            
+            age_buckets = {
+                "recent": recent,              # ≤ 30 days
+                "old": object_count - recent,  # > 30 days
+            }
+            
+            # File extensions, most common first
+            file_extensions = {
+                extension: {"count": count, "size": extension_sizes[extension]}
+                for extension, count in extension_counts.most_common()
+            }
             
             return {
                 "bucket_name": bucket_name,
                 "region": region,
                 "object_count": object_count,
                 "total_size": total_size,
-                "sampled": object_count > 100000000 and len(objects) < object_count,
+                "sampled": not self.summary_only and len(objects) < object_count,
                 "sample_size": len(objects),
-                "storage_classes": storage_classes,
-                "file_extensions": dict(sorted_extensions),
+                "storage_classes": dict(storage_classes),
+                "file_extensions": file_extensions,
                 "age_buckets": age_buckets,
                 "objects": objects,
                 "inventory_date": datetime.now().isoformat(),
             }
             
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code == 'AccessDenied':
-                return {
-                    "bucket_name": bucket_name,
-                    "error": "Access denied",
-                    "object_count": 0,
-                    "total_size": 0,
-                    "objects": [],
-                }
-            else:
+            error = BUCKET_ERROR_MESSAGES.get(e.response['Error']['Code'])
+            if error is None:
                 raise
+            return {
+                "bucket_name": bucket_name,
+                "error": error,
+                "object_count": 0,
+                "total_size": 0,
+                "objects": [],
+            }
+    
+    def _iter_object_listing(
+        self,
+        bucket_name: str,
+        region: str,
+        client: Any,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """List every object in a bucket, yielding batches of objects.
+        
+        A single ListObjectsV2 page is fetched first; buckets that fit in it
+        are done. Larger buckets are read from their S3 Inventory report when
+        a recent one exists. Otherwise the rest of the key space is split into
+        ranges at LIST_SHARD_BOUNDARIES, each listed by its own paginator, and
+        batches arrive in key order.
+        
+        Args:
+            bucket_name: Name of the bucket to list
+            region: Region the bucket lives in
+            client: S3 client for the bucket's region
+            
+        Yields:
+            Lists of ListObjectsV2 ``Contents`` entries
+        """
+        response = client.list_objects_v2(Bucket=bucket_name, MaxKeys=1000)
+        contents = response.get('Contents', [])
+        
+        if not response.get('IsTruncated') or not contents:
+            yield contents
+            return
+        
+        manifest = self._find_inventory_manifest(bucket_name) if self.use_s3_inventory else None
+        if manifest is not None:
+            if self.verbose:
+                print(f"Reading {bucket_name} from S3 Inventory report")
+            yield from self._iter_inventory_report(manifest)
+            return
+        
+        yield contents
+        
+        if self.max_parallel_listings == 1:
+            # Serial listing, page by page
+            paginator = client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(
+                Bucket=bucket_name,
+                StartAfter=contents[-1]['Key'],
+                PaginationConfig={'PageSize': 1000}
+            ):
+                yield page.get('Contents', [])
+            return
+        
+        # Each shard covers (start_after, stop_at]; together they span every
+        # key after the first page without overlap
+        last_key = contents[-1]['Key']
+        boundaries = [b for b in LIST_SHARD_BOUNDARIES if b > last_key]
+        starts = [last_key] + boundaries
+        stops: List[Optional[str]] = [*boundaries, None]
+        
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_parallel_listings, len(starts))
+        )
+        try:
+            # Shards are submitted in key order, so the one being consumed is
+            # always running or done and its pages keep flowing
+            shards: Deque[Tuple[Future, _PageQueue]] = deque()
+            for start, stop_at in zip(starts, stops):
+                pages: _PageQueue = queue.Queue(maxsize=LIST_SHARD_QUEUE_PAGES)
+                future = executor.submit(
+                    self._list_key_range, bucket_name, region, start, stop_at, pages, stop
+                )
+                shards.append((future, pages))
+            
+            while shards:
+                future, pages = shards.popleft()
+                while (page := pages.get()) is not None:
+                    yield page
+                # Re-raise a listing error once the shard's pages are drained
+                future.result()
+        finally:
+            # Stop running shards after their current request and drop the
+            # ones that haven't started if the caller stopped early
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _find_inventory_manifest(self, bucket_name: str) -> Optional[Dict[str, Any]]:
+        """Locate the latest complete S3 Inventory manifest for a bucket.
+        
+        Only enabled, unfiltered, current-version CSV or Parquet reports that
+        carry the size, last-modified and storage-class fields qualify, and
+        only if the report is at most S3_INVENTORY_MAX_AGE old.
+        
+        Args:
+            bucket_name: Source bucket of the report
+            
+        Returns:
+            Parsed manifest.json, or None if no usable report exists
+        """
+        client = self._client()
+        try:
+            configurations = client.list_bucket_inventory_configurations(
+                Bucket=bucket_name
+            ).get('InventoryConfigurationList', [])
+        except ClientError:
+            return None
+        
+        for configuration in configurations:
+            destination = configuration['Destination']['S3BucketDestination']
+            if (
+                not configuration.get('IsEnabled')
+                or configuration.get('Filter')
+                or configuration.get('IncludedObjectVersions') != 'Current'
+                or destination['Format'] not in S3_INVENTORY_COLUMNS
+                or not S3_INVENTORY_REQUIRED_FIELDS <= set(configuration.get('OptionalFields', ()))
+            ):
+                continue
+            
+            # Reports land under <prefix>/<source bucket>/<config id>/<timestamp>/
+            destination_bucket = destination['Bucket'].split(':::')[-1]
+            report_prefix = f"{destination['Prefix']}/" if destination.get('Prefix') else ""
+            report_prefix += f"{bucket_name}/{configuration['Id']}/"
+            
+            try:
+                paginator = client.get_paginator('list_objects_v2')
+                runs = sorted(
+                    common_prefix['Prefix']
+                    for page in paginator.paginate(
+                        Bucket=destination_bucket, Prefix=report_prefix, Delimiter='/'
+                    )
+                    for common_prefix in page.get('CommonPrefixes', ())
+                    if S3_INVENTORY_RUN_PATTERN.fullmatch(
+                        common_prefix['Prefix'], len(report_prefix)
+                    )
+                )
+                
+                # The newest run may still be being written; fall back one day
+                for run in reversed(runs[-2:]):
+                    try:
+                        body = client.get_object(
+                            Bucket=destination_bucket, Key=f"{run}manifest.json"
+                        )['Body'].read()
+                    except ClientError:
+                        continue
+                    
+                    manifest: Dict[str, Any] = orjson.loads(body)
+                    created = datetime.fromtimestamp(
+                        int(manifest['creationTimestamp']) / 1000, tz=timezone.utc
+                    )
+                    if datetime.now(timezone.utc) - created > S3_INVENTORY_MAX_AGE:
+                        break
+                    return manifest
+            except ClientError:
+                continue
+        
+        return None
+    
+    def _iter_inventory_report(self, manifest: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+        """Read the data files of an S3 Inventory report as listing batches.
+        
+        Args:
+            manifest: Parsed manifest.json from _find_inventory_manifest
+            
+        Yields:
+            Lists of objects shaped like ListObjectsV2 ``Contents`` entries
+        """
+        # Deferred so only runs that read inventory reports load pyarrow
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+        from urllib.parse import unquote_plus
+        
+        client = self._client()
+        file_format = manifest['fileFormat']
+        columns = S3_INVENTORY_COLUMNS[file_format]
+        destination_bucket = manifest['destinationBucket'].split(':::')[-1]
+        
+        if file_format == 'CSV':
+            schema = [name.strip() for name in manifest['fileSchema'].split(',')]
+            read_options = pa_csv.ReadOptions(column_names=schema)
+            convert_options = pa_csv.ConvertOptions(
+                include_columns=[name for name in columns.values() if name in schema],
+                column_types={
+                    columns['Size']: pa.int64(),
+                    columns['LastModified']: pa.timestamp('ms', tz='UTC'),
+                },
+            )
+        
+        for data_file in manifest['files']:
+            body = client.get_object(Bucket=destination_bucket, Key=data_file['key'])['Body'].read()
+            
+            if file_format == 'Parquet':
+                parquet_file = pq.ParquetFile(pa.BufferReader(body))
+                available = set(parquet_file.schema_arrow.names)
+                batches = parquet_file.iter_batches(
+                    columns=[name for name in columns.values() if name in available]
+                )
+            else:
+                batches = pa_csv.open_csv(
+                    pa.input_stream(pa.py_buffer(body), compression='gzip'),
+                    read_options=read_options,
+                    convert_options=convert_options,
+                )
+            
+            for batch in batches:
+                data = batch.to_pydict()
+                keys = data[columns['Key']]
+                if file_format == 'CSV':
+                    # CSV reports URL-encode object keys
+                    keys = [unquote_plus(key) for key in keys]
+                
+                yield [
+                    {
+                        "Key": key,
+                        "Size": size or 0,
+                        "LastModified": last_modified,
+                        "StorageClass": storage_class or 'STANDARD',
+                        "ETag": etag or '',
+                    }
+                    for key, size, last_modified, storage_class, etag in zip(
+                        keys,
+                        data[columns['Size']],
+                        data[columns['LastModified']],
+                        data[columns['StorageClass']],
+                        data.get(columns['ETag']) or [None] * len(keys),
+                    )
+                ]
+    
+    def _list_key_range(
+        self,
+        bucket_name: str,
+        region: str,
+        start_after: str,
+        stop_at: Optional[str],
+        pages: _PageQueue,
+        stop: threading.Event,
+    ) -> None:
+        """List the objects with start_after < key <= stop_at into a queue.
+        
+        Pages are put on the queue as they arrive, followed by None once the
+        range is done or listing failed. Listing ends early when stop is set.
+        """
+        try:
+            paginator = self._client(region).get_paginator('list_objects_v2')
+            page_iterator = paginator.paginate(
+                Bucket=bucket_name,
+                StartAfter=start_after,
+                PaginationConfig={'PageSize': 1000}
+            )
+            
+            for page in page_iterator:
+                contents = page.get('Contents', [])
+                if stop_at is not None and contents and contents[-1]['Key'] > stop_at:
+                    _put_page(pages, [obj for obj in contents if obj['Key'] <= stop_at], stop)
+                    return
+                if not _put_page(pages, contents, stop):
+                    return
+        finally:
+            _put_page(pages, None, stop)
+    
+    def _object_record(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a listed object to its per-object inventory record."""
+        return {
+            "key": obj['Key'],
+            "size": obj['Size'],
+            "last_modified": obj['LastModified'].isoformat(),
+            "storage_class": obj.get('StorageClass', 'STANDARD'),
+            "etag": obj.get('ETag', ''),
+        }
     
     def _get_file_extension(self, key: str) -> str:
         """Extract file extension from S3 key.
@@ -258,25 +730,44 @@ class S3Inventory:
         if key.endswith('/'):
             return "directory"
         
-        # Extract extension
-        path = Path(key)
-        extension = path.suffix.lower()
-        
-        if extension:
-            return extension[1:]  # Remove the dot
-        else:
+        # Same rules as Path.suffix without building a Path per key: the dot
+        # must be inside the last path component, not lead it (dotfiles) and
+        # not end it
+        dot = key.rfind('.')
+        if dot <= key.rfind('/') + 1 or dot == len(key) - 1:
             return "no-extension"
+        return key[dot + 1:].lower()
     
-    def write_inventory(self, inventory_data: Dict[str, Any], output_file: str) -> None:
+    def write_inventory(
+        self,
+        inventory_data: Union[Mapping[str, Any], Iterable[Tuple[str, Dict[str, Any]]]],
+        output_file: str,
+    ) -> None:
         """Write inventory data to JSONL file.
         
+        Values JSON has no type for (e.g. Decimal) are written as strings,
+        and output files ending in .gz are gzip-compressed. Passing an
+        iterator such as iter_inventory writes each bucket as soon as it is
+        collected, so its object list can be freed straight away.
+        
         Args:
-            inventory_data: Inventory data dictionary
+            inventory_data: Inventory data dictionary, or an iterable of
+                (bucket_name, bucket_data) pairs
             output_file: Output file path
         """
-        with open(output_file, 'w') as f:
-            for bucket_name, bucket_data in inventory_data.items():
-                f.write(json.dumps(bucket_data) + '\n')
+        if isinstance(inventory_data, Mapping):
+            inventory_data = inventory_data.items()
+        
+        buffer = bytearray()
+        with _open_inventory(output_file, 'wb') as f:
+            for _, bucket_data in inventory_data:
+                buffer += orjson.dumps(
+                    bucket_data, default=str, option=orjson.OPT_APPEND_NEWLINE
+                )
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
     
     def load_inventory(self, inventory_file: str) -> Dict[str, Any]:
         """Load inventory data from JSONL file.
@@ -287,12 +778,45 @@ class S3Inventory:
         Returns:
             Dictionary with bucket inventory data
         """
-        inventory_data = {}
+        return dict(self.iter_inventory_file(inventory_file))
+    
+    def iter_inventory_file(self, inventory_file: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Read inventory data from JSONL file one bucket at a time.
+        
+        Files ending in .gz are decompressed as they are read.
+        
+        Args:
+            inventory_file: Input file path
+            
+        Yields:
+            Tuples of (bucket_name, bucket_data)
+        """
+        if inventory_file.endswith('.gz'):
+            with _open_inventory(inventory_file, 'rb') as f:
+                yield from self._parse_inventory_lines(f)
+            return
         
-        with open(inventory_file, 'r') as f:
-            for line in f:
-                bucket_data = json.loads(line.strip())
-                bucket_name = bucket_data.get('bucket_name', 'unknown')
-                inventory_data[bucket_name] = bucket_data
+        with open(inventory_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            # Map the file instead of reading it through a buffer; each line is
+            # parsed by orjson and dropped before the next is read
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from self._parse_inventory_lines(iter(mapped.readline, b''))
+    
+    def _parse_inventory_lines(self, lines: Iterable[bytes]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Parse JSONL inventory lines into (bucket_name, bucket_data) pairs.
         
-        return inventory_data 
\ No newline at end of file
+        Args:
+            lines: Raw lines of an inventory file
+            
+        Yields:
+            Tuples of (bucket_name, bucket_data)
+        """
+        for line in lines:
+            if not line.strip():
+                continue
+            bucket_data = orjson.loads(line)
+            bucket_name = bucket_data.get('bucket_name', 'unknown')
+            yield bucket_name, bucket_data
@@ -1,12 +1,139 @@
 """S3 report publishing module."""
 
+import functools
+import html
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from .utils import get_aws_account_id
+
+# Report files are small, so uploads are bound by round trips; send them
+# concurrently over one shared (thread-safe) client
+UPLOAD_WORKERS = 16
+
+# Large files are split into 8 MiB parts uploaded in parallel
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+# Content-Type sent with each uploaded file, by lower-cased extension
+CONTENT_TYPES = {
+    '.csv': 'text/csv',
+    '.json': 'application/json',
+    '.md': 'text/markdown',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.html': 'text/html',
+}
+
+# Static parts of the published index page, built once at import
+_INDEX_HTML_HEAD = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>S3-Insight Reports</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 30px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+            text-align: center;
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 2.5em;
+            font-weight: 300;
+        }
+        .header p {
+            margin: 10px 0 0 0;
+            opacity: 0.9;
+        }
+        .reports-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .report-card {
+            background: white;
+            border-radius: 10px;
+            padding: 20px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            transition: transform 0.2s;
+        }
+        .report-card:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 20px rgba(0,0,0,0.15);
+        }
+        .report-card h3 {
+            margin: 0 0 10px 0;
+            color: #333;
+        }
+        .report-card p {
+            margin: 0 0 15px 0;
+            color: #666;
+            font-size: 0.9em;
+        }
+        .report-link {
+            display: inline-block;
+            background: #667eea;
+            color: white;
+            text-decoration: none;
+            padding: 8px 16px;
+            border-radius: 5px;
+            font-size: 0.9em;
+            transition: background 0.2s;
+        }
+        .report-link:hover {
+            background: #5a6fd8;
+        }
+        .footer {
+            text-align: center;
+            color: #666;
+            margin-top: 40px;
+            padding: 20px;
+            border-top: 1px solid #ddd;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📊 S3-Insight Reports</h1>
+        <p>Comprehensive AWS S3 bucket inventory and analytics</p>
+"""
+
+_INDEX_HTML_FOOT = """
+    </div>
+    
+    <div class="footer">
+        <p>Generated by <strong>S3-Insight</strong> - AWS S3 bucket inventory and analytics tool</p>
+    </div>
+</body>
+</html>
+"""
 
 
 class S3Publisher:
@@ -20,8 +147,17 @@ class S3Publisher:
         """
         self.profile = profile
         self.session = self._create_session()
-        self.account_id = self._get_account_id()
-        self.reports_bucket = f"s3-insight-reports-{self.account_id}"
+        self._bucket_ready = False
+    
+    @functools.cached_property
+    def account_id(self) -> str:
+        """AWS account ID, looked up on first use."""
+        return self._get_account_id()
+    
+    @functools.cached_property
+    def reports_bucket(self) -> str:
+        """Name of the account's reports bucket."""
+        return f"s3-insight-reports-{self.account_id}"
     
     def _create_session(self) -> boto3.Session:
         """Create boto3 session with profile if specified."""
@@ -30,13 +166,8 @@ class S3Publisher:
         return boto3.Session()
     
     def _get_account_id(self) -> str:
-        """Get AWS account ID."""
-        try:
-            sts_client = self.session.client('sts')
-            response = sts_client.get_caller_identity()
-            return response['Account']
-        except (NoCredentialsError, ClientError) as e:
-            raise RuntimeError(f"Failed to get account ID: {e}")
+        """Get AWS account ID, shared with other lookups for the same profile."""
+        return get_aws_account_id(self.profile)
     
     def publish_reports(self, report_files: Dict[str, str]) -> List[str]:
         """Upload all report files to S3 reports bucket.
@@ -50,31 +181,50 @@ class S3Publisher:
         # Ensure reports bucket exists
         self._ensure_reports_bucket()
         
-        upload_urls = []
-        
-        for report_type, filepath in report_files.items():
-            if os.path.exists(filepath):
-                url = self._upload_file(filepath, report_type)
-                upload_urls.append(url)
+        uploads = [
+            (filepath, report_type)
+            for report_type, filepath in report_files.items()
+            if os.path.exists(filepath)
+        ]
         
         # Upload charts if they exist
         charts_dir = os.path.dirname(list(report_files.values())[0]) if report_files else "charts"
         if os.path.exists(charts_dir):
-            chart_files = self._get_chart_files(charts_dir)
-            for chart_file in chart_files:
-                url = self._upload_file(chart_file, "charts")
-                upload_urls.append(url)
+            uploads.extend(
+                (chart_file, "charts") for chart_file in self._get_chart_files(charts_dir)
+            )
+        
+        if not uploads:
+            return []
+        
+        # One timestamp for the whole run keeps its files in the same folders
+        s3_client = self.session.client('s3')
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        return upload_urls
+        upload_one = functools.partial(
+            self._upload_file, s3_client=s3_client, timestamp=timestamp
+        )
+        filepaths = [filepath for filepath, _ in uploads]
+        file_types = [file_type for _, file_type in uploads]
+        
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(uploads))) as executor:
+            return list(executor.map(upload_one, filepaths, file_types))
     
     def _ensure_reports_bucket(self) -> None:
-        """Create reports bucket if it doesn't exist."""
+        """Create reports bucket if it doesn't exist.
+        
+        Skipped when this publisher already confirmed the bucket exists.
+        """
+        if self._bucket_ready:
+            return
+        
         try:
             s3_client = self.session.client('s3')
             
             # Check if bucket exists
             try:
                 s3_client.head_bucket(Bucket=self.reports_bucket)
+                self._bucket_ready = True
                 return  # Bucket exists
             except ClientError as e:
                 error_code = e.response['Error']['Code']
@@ -87,7 +237,8 @@ class S3Publisher:
             # Create bucket in us-east-1 (default)
             s3_client.create_bucket(Bucket=self.reports_bucket)
             
-            # Add bucket policy for public read access to reports
+            # Add bucket policy for public read access to reports; objects
+            # are uploaded without ACLs and rely on this policy
             bucket_policy = {
                 "Version": "2012-10-17",
                 "Statement": [
@@ -115,25 +266,37 @@ class S3Publisher:
                 }
             )
             
+            self._bucket_ready = True
+            
         except ClientError as e:
             raise RuntimeError(f"Failed to create reports bucket: {e}")
     
-    def _upload_file(self, filepath: str, file_type: str) -> str:
+    def _upload_file(
+        self,
+        filepath: str,
+        file_type: str,
+        s3_client: Optional[Any] = None,
+        timestamp: Optional[str] = None,
+    ) -> str:
         """Upload a single file to S3 reports bucket.
         
         Args:
             filepath: Local file path
             file_type: Type of file (reports, charts, etc.)
+            s3_client: S3 client to reuse; a new one is created if omitted
+            timestamp: Upload folder timestamp; defaults to now
             
         Returns:
             S3 URL of uploaded file
         """
         try:
-            s3_client = self.session.client('s3')
+            if s3_client is None:
+                s3_client = self.session.client('s3')
             
             # Determine S3 key
             filename = os.path.basename(filepath)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if timestamp is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             s3_key = f"{file_type}/{timestamp}/{filename}"
             
             # Upload file
@@ -141,17 +304,16 @@ class S3Publisher:
                 filepath,
                 self.reports_bucket,
                 s3_key,
-                ExtraArgs={
-                    'ContentType': self._get_content_type(filename),
-                    'ACL': 'public-read'
-                }
+                ExtraArgs={'ContentType': self._get_content_type(filename)},
+                Config=TRANSFER_CONFIG,
             )
             
             # Return public URL
             url = f"https://{self.reports_bucket}.s3.amazonaws.com/{s3_key}"
             return url
             
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
+            # upload_file reports failed transfers as S3UploadFailedError
             raise RuntimeError(f"Failed to upload {filepath}: {e}")
     
     def _get_chart_files(self, charts_dir: str) -> List[str]:
@@ -178,17 +340,9 @@ class S3Publisher:
         Returns:
             Content type string
         """
-        ext = os.path.splitext(filename)[1].lower()
-        content_types = {
-            '.csv': 'text/csv',
-            '.json': 'application/json',
-            '.md': 'text/markdown',
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.html': 'text/html',
-        }
-        return content_types.get(ext, 'application/octet-stream')
+        return CONTENT_TYPES.get(
+            os.path.splitext(filename)[1].lower(), 'application/octet-stream'
+        )
     
     def create_index_page(self, report_urls: List[str]) -> str:
         """Create and upload an index page for the reports.
@@ -213,10 +367,7 @@ class S3Publisher:
                 index_file,
                 self.reports_bucket,
                 'index.html',
-                ExtraArgs={
-                    'ContentType': 'text/html',
-                    'ACL': 'public-read'
-                }
+                ExtraArgs={'ContentType': 'text/html'}
             )
             
             # Return index URL
@@ -237,126 +388,36 @@ class S3Publisher:
         Returns:
             HTML content
         """
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>S3-Insight Reports</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 300;
-        }}
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-        }}
-        .reports-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .report-card {{
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            transition: transform 0.2s;
-        }}
-        .report-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 20px rgba(0,0,0,0.15);
-        }}
-        .report-card h3 {{
-            margin: 0 0 10px 0;
-            color: #333;
-        }}
-        .report-card p {{
-            margin: 0 0 15px 0;
-            color: #666;
-            font-size: 0.9em;
-        }}
-        .report-link {{
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            text-decoration: none;
-            padding: 8px 16px;
-            border-radius: 5px;
-            font-size: 0.9em;
-            transition: background 0.2s;
-        }}
-        .report-link:hover {{
-            background: #5a6fd8;
-        }}
-        .footer {{
-            text-align: center;
-            color: #666;
-            margin-top: 40px;
-            padding: 20px;
-            border-top: 1px solid #ddd;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📊 S3-Insight Reports</h1>
-        <p>Comprehensive AWS S3 bucket inventory and analytics</p>
-        <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-    </div>
-    
-    <div class="reports-grid">
-"""
-        
         # Group reports by type
-        reports_by_type = {}
+        reports_by_type: Dict[str, List[str]] = {}
         for url in report_urls:
             if '/reports/' in url:
                 reports_by_type.setdefault('Reports', []).append(url)
             elif '/charts/' in url:
                 reports_by_type.setdefault('Charts', []).append(url)
         
-        # Generate cards for each report type
+        # Collect the page in a list and join once; URLs and filenames are
+        # escaped since they come from object keys
+        parts = [
+            _INDEX_HTML_HEAD,
+            f"        <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>\n"
+            "    </div>\n"
+            "    \n"
+            '    <div class="reports-grid">\n',
+        ]
         for report_type, urls in reports_by_type.items():
-            html += f"""
-        <div class="report-card">
-            <h3>{report_type}</h3>
-            <p>Download and view {report_type.lower()} generated from S3 inventory data.</p>
-"""
-            
-            for url in urls:
-                filename = url.split('/')[-1]
-                html += f'            <a href="{url}" class="report-link" target="_blank">{filename}</a><br><br>\n'
-            
-            html += "        </div>\n"
-        
-        html += """
-    </div>
-    
-    <div class="footer">
-        <p>Generated by <strong>S3-Insight</strong> - AWS S3 bucket inventory and analytics tool</p>
-    </div>
-</body>
-</html>
-"""
+            parts.append(
+                "\n"
+                '        <div class="report-card">\n'
+                f"            <h3>{report_type}</h3>\n"
+                f"            <p>Download and view {report_type.lower()} generated from S3 inventory data.</p>\n"
+            )
+            parts.extend(
+                f'            <a href="{html.escape(url)}" class="report-link" target="_blank">'
+                f"{html.escape(url.split('/')[-1])}</a><br><br>\n"
+                for url in urls
+            )
+            parts.append("        </div>\n")
+        parts.append(_INDEX_HTML_FOOT)
         
-        return html 
\ No newline at end of file
+        return "".join(parts) 
\ No newline at end of file
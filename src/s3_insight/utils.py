@@ -1,15 +1,21 @@
 """Utility functions for S3-Insight."""
 
-import subprocess
+import functools
 from typing import Optional
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB", "PB")
+_SIZE_DIVISORS = tuple(1024**i for i in range(len(_SIZE_NAMES)))
 
+
+@functools.lru_cache(maxsize=None)
 def get_aws_account_id(profile: Optional[str] = None) -> str:
     """Get AWS account ID using STS.
     
+    The result is cached per profile for the life of the process.
+    
     Args:
         profile: AWS profile to use
         
@@ -45,12 +51,10 @@ def format_bytes(bytes_value: int) -> str:
     if bytes_value == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB", "PB"]
-    import math
-    i = int(math.floor(math.log(bytes_value, 1024)))
-    p = math.pow(1024, i)
-    s = round(bytes_value / p, 2)
-    return f"{s} {size_names[i]}"
+    # Every 10 bits is one 1024x unit step
+    i = min((int(abs(bytes_value)).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
+    s = round(bytes_value / _SIZE_DIVISORS[i], 2)
+    return f"{s} {_SIZE_NAMES[i]}"
 
 
 def format_number(number: int) -> str:
@@ -65,35 +69,6 @@ def format_number(number: int) -> str:
     return f"{number:,}"
 
 
-def run_aws_cli_command(command: list, profile: Optional[str] = None) -> str:
-    """Run AWS CLI command and return output.
-    
-    Args:
-        command: List of command arguments
-        profile: AWS profile to use
-        
-    Returns:
-        Command output as string
-        
-    Raises:
-        RuntimeError: If command fails
-    """
-    try:
-        if profile:
-            command = ["aws", "--profile", profile] + command[1:]
-        
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-        
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"AWS CLI command failed: {e.stderr}")
-
-
 def validate_aws_credentials(profile: Optional[str] = None) -> bool:
     """Validate AWS credentials are configured and working.
     
@@ -110,9 +85,13 @@ def validate_aws_credentials(profile: Optional[str] = None) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def get_s3_bucket_region(bucket_name: str, profile: Optional[str] = None) -> str:
     """Get the region of an S3 bucket.
     
+    Results are cached per bucket and profile; a bucket's region never
+    changes.
+    
     Args:
         bucket_name: Name of the S3 bucket
         profile: AWS profile to use
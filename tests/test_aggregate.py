@@ -2,7 +2,7 @@
 
 import pytest
 
-from s3_insight.aggregate import S3Aggregator
+from s3_insight.aggregate import S3Aggregator, dumps_metrics, loads_metrics
 
 
 class TestS3Aggregator:
@@ -69,6 +69,29 @@ class TestS3Aggregator:
         assert age_breakdown["old"]["count"] == 400
         assert age_breakdown["old"]["percentage"] == 40.0
     
+    def test_compute_bucket_metrics_breakdowns_not_shared(self):
+        """Test that buckets with equal tallies get independent breakdowns."""
+        aggregator = S3Aggregator()
+        
+        bucket_data = {
+            "bucket_name": "bucket",
+            "region": "us-east-1",
+            "object_count": 10,
+            "total_size": 100,
+            "storage_classes": {"STANDARD": 10},
+            "file_extensions": {},
+            "age_buckets": {"recent": 4, "old": 6},
+            "inventory_date": "2023-01-01T00:00:00"
+        }
+        
+        first = aggregator._compute_bucket_metrics(bucket_data)
+        first["storage_class_breakdown"]["STANDARD"]["count"] = -1
+        first["age_breakdown"]["recent"]["count"] = -1
+        second = aggregator._compute_bucket_metrics(dict(bucket_data))
+        
+        assert second["storage_class_breakdown"]["STANDARD"]["count"] == 10
+        assert second["age_breakdown"]["recent"]["count"] == 4
+    
     def test_compute_bucket_metrics_zero_objects(self):
         """Test bucket metrics computation with zero objects."""
         aggregator = S3Aggregator()
@@ -134,6 +157,7 @@ class TestS3Aggregator:
         inventory_data = {
             "bucket1": {
                 "bucket_name": "bucket1",
+                "region": "us-east-1",
                 "object_count": 100,
                 "total_size": 1024000,
                 "storage_classes": {"STANDARD": 100},
@@ -156,6 +180,28 @@ class TestS3Aggregator:
         assert "bucket1" in bucket_metrics
         assert "bucket2" not in bucket_metrics
     
+    def test_aggregate_buckets_from_iterator(self):
+        """Test bucket aggregation from a stream of (name, data) pairs."""
+        aggregator = S3Aggregator()
+        
+        def stream():
+            for i in range(3):
+                yield f"bucket{i}", {
+                    "bucket_name": f"bucket{i}",
+                    "region": "us-east-1",
+                    "object_count": 10 * (i + 1),
+                    "total_size": 1024 * (i + 1),
+                    "storage_classes": {"STANDARD": 10 * (i + 1)},
+                    "file_extensions": {"txt": {"count": 10 * (i + 1), "size": 1024 * (i + 1)}},
+                    "age_buckets": {"recent": 10 * (i + 1), "old": 0},
+                    "inventory_date": "2023-01-01T00:00:00"
+                }
+        
+        bucket_metrics = aggregator.aggregate_buckets(stream())
+        
+        assert list(bucket_metrics) == ["bucket0", "bucket1", "bucket2"]
+        assert bucket_metrics["bucket2"]["object_count"] == 30
+    
     def test_aggregate_account(self):
         """Test account-level aggregation."""
         aggregator = S3Aggregator()
@@ -206,6 +252,93 @@ class TestS3Aggregator:
         assert account_metrics["age_buckets"]["recent"] == 180
         assert account_metrics["age_buckets"]["old"] == 120
     
+    def test_aggregate_account_breakdowns(self):
+        """Test account-level storage class and extension totals."""
+        aggregator = S3Aggregator()
+        
+        bucket_metrics = {
+            "bucket1": {
+                "region": "us-east-1",
+                "object_count": 100,
+                "total_size": 1000,
+                "storage_classes": {"STANDARD": 60, "GLACIER": 40},
+                "file_extensions": {
+                    "txt": {"count": 30, "size": 300},
+                    "jpg": {"count": 70, "size": 700},
+                },
+                "age_buckets": {"recent": 100, "old": 0},
+                "sampled": False,
+            },
+            "bucket2": {
+                "region": "us-east-1",
+                "object_count": 50,
+                "total_size": 5000,
+                "storage_classes": {"STANDARD": 50},
+                "file_extensions": {"txt": {"count": 50, "size": 5000}},
+                "age_buckets": {"recent": 0, "old": 50},
+                "sampled": False,
+            },
+        }
+        
+        account_metrics = aggregator.aggregate_account(bucket_metrics)
+        
+        storage_classes = account_metrics["storage_classes"]
+        assert list(storage_classes) == ["STANDARD", "GLACIER"]
+        assert storage_classes["STANDARD"]["count"] == 110
+        assert storage_classes["STANDARD"]["size"] == pytest.approx(5600)
+        assert storage_classes["GLACIER"]["count"] == 40
+        assert storage_classes["GLACIER"]["size"] == pytest.approx(400)
+        assert storage_classes["GLACIER"]["size_gb"] == pytest.approx(400 / (1024**3))
+        
+        file_extensions = account_metrics["file_extensions"]
+        assert list(file_extensions) == ["txt", "jpg"]
+        assert file_extensions["txt"] == {
+            "count": 80,
+            "size": 5300,
+            "size_gb": 5300 / (1024**3),
+        }
+        assert file_extensions["jpg"]["count"] == 70
+        assert account_metrics["regions"] == {"us-east-1": 2}
+    
+    def test_aggregate_account_merges_breakdowns(self):
+        """Test merging breakdowns from buckets with differing categories."""
+        aggregator = S3Aggregator()
+        
+        bucket_metrics = {
+            f"bucket{i}": {
+                "region": "us-east-1" if i % 2 else "eu-west-1",
+                "object_count": 10 * (i + 1),
+                "total_size": 1000 * (i + 1),
+                "storage_classes": {"STANDARD": 5 * (i + 1), "GLACIER": 5 * (i + 1)},
+                "file_extensions": {
+                    "txt": {"count": 4 * (i + 1), "size": 400 * (i + 1)},
+                    f"ext{i % 3}": {"count": 6 * (i + 1), "size": 600 * (i + 1)},
+                },
+                "age_buckets": {"recent": i, "old": 1},
+                "sampled": False,
+            }
+            for i in range(40)
+        }
+        
+        account_metrics = aggregator.aggregate_account(bucket_metrics)
+        assert list(account_metrics["file_extensions"])[0] == "txt"
+        assert account_metrics["file_extensions"]["txt"]["count"] == 3280
+        assert account_metrics["storage_classes"]["STANDARD"]["count"] == 4100
+        assert account_metrics["storage_classes"]["GLACIER"]["size"] == pytest.approx(
+            sum(500 * (i + 1) for i in range(40))
+        )
+    
+    def test_aggregate_account_empty(self):
+        """Test account-level aggregation with no buckets."""
+        aggregator = S3Aggregator()
+        
+        account_metrics = aggregator.aggregate_account({})
+        
+        assert account_metrics["bucket_count"] == 0
+        assert account_metrics["storage_classes"] == {}
+        assert account_metrics["file_extensions"] == {}
+        assert account_metrics["regions"] == {}
+    
     def test_get_top_buckets(self):
         """Test getting top buckets."""
         aggregator = S3Aggregator()
@@ -243,4 +376,25 @@ class TestS3Aggregator:
         top_extensions = aggregator.get_top_extensions(account_metrics, top_n=2)
         assert len(top_extensions) == 2
         assert top_extensions[0]["extension"] == "jpg"
-        assert top_extensions[1]["extension"] == "txt" 
\ No newline at end of file
+        assert top_extensions[1]["extension"] == "txt"
+    
+    def test_dumps_loads_metrics_round_trip(self):
+        """Test metrics survive JSON serialization unchanged."""
+        aggregator = S3Aggregator()
+        
+        bucket_metrics = {
+            f"bucket{i}": {
+                "region": "us-east-1",
+                "object_count": 10,
+                "total_size": 1000,
+                "storage_classes": {"STANDARD": 10},
+                "file_extensions": {"txt": {"count": 10, "size": 1000}},
+                "age_buckets": {"recent": 10, "old": 0},
+                "sampled": False,
+            }
+            for i in range(40)
+        }
+        account_metrics = aggregator.aggregate_account(bucket_metrics)
+        
+        assert loads_metrics(dumps_metrics(account_metrics)) == account_metrics
+        assert loads_metrics(dumps_metrics(account_metrics, indent=True)) == account_metrics
@@ -0,0 +1,152 @@
+"""Tests for the charts module."""
+
+import glob
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from s3_insight.aggregate import S3Aggregator
+from s3_insight.charts import ChartGenerator
+
+ALL_CHARTS = {
+    "filetype_pie": "filetype_pie",
+    "storageclass_bar": "storageclass_bar",
+    "top_buckets_bar": "top_buckets_bar",
+    "age_distribution_pie": "age_distribution_pie",
+    "region_distribution_pie": "region_distribution_pie",
+    "dashboard": "comprehensive_dashboard",
+}
+
+# Content-addressed images, as opposed to the stable <chart>.png links
+CACHED_IMAGES = "*_" + "[0-9a-f]" * 24 + ".png"
+
+
+def _metrics(scale=1, inventory_date="2023-01-01T00:00:00"):
+    """Build bucket and account metrics for two small buckets."""
+    inventory_data = {
+        f"bucket-{i}": {
+            "bucket_name": f"bucket-{i}",
+            "region": region,
+            "object_count": 100 * scale,
+            "total_size": 1024000 * scale * (i + 1),
+            "storage_classes": {"STANDARD": 60 * scale, "GLACIER": 40 * scale},
+            "file_extensions": {
+                "jpg": {"count": 70 * scale, "size": 716800 * scale},
+                "txt": {"count": 30 * scale, "size": 307200 * scale},
+            },
+            "age_buckets": {"recent": 50 * scale, "old": 50 * scale},
+            "inventory_date": inventory_date,
+        }
+        for i, region in enumerate(["us-east-1", "eu-west-1"])
+    }
+    
+    aggregator = S3Aggregator()
+    bucket_metrics = aggregator.aggregate_buckets(inventory_data)
+    return bucket_metrics, aggregator.aggregate_account(bucket_metrics)
+
+
+class TestChartGenerator:
+    """Test cases for ChartGenerator class."""
+    
+    def test_cached_charts_are_not_rendered_again(self, tmp_path):
+        """Test that unchanged data reuses the cached images."""
+        bucket_metrics, account_metrics = _metrics()
+        generator = ChartGenerator(output_dir=str(tmp_path), max_workers=1)
+        
+        first = generator.generate_charts(bucket_metrics, account_metrics)
+        cached = sorted(glob.glob(str(tmp_path / CACHED_IMAGES)))
+        
+        with patch.object(generator, '_render_pending', wraps=generator._render_pending) as render:
+            second = generator.generate_charts(bucket_metrics, account_metrics)
+        
+        render.assert_called_once_with([])
+        assert second == first
+        assert sorted(glob.glob(str(tmp_path / CACHED_IMAGES))) == cached
+        for path in second.values():
+            assert os.path.realpath(path) in cached
+    
+    def test_new_inventory_with_same_data_is_cached(self, tmp_path):
+        """Test that a fresh inventory date alone does not redraw any chart."""
+        generator = ChartGenerator(output_dir=str(tmp_path), max_workers=1)
+        
+        first = generator.generate_charts(*_metrics(inventory_date="2023-01-01T00:00:00"))
+        
+        with patch.object(generator, '_render_pending', wraps=generator._render_pending) as render:
+            second = generator.generate_charts(*_metrics(inventory_date="2023-01-02T00:00:00"))
+        
+        render.assert_called_once_with([])
+        assert second == first
+    
+    def test_changed_charts_replace_cached_images(self, tmp_path):
+        """Test that new data is rendered and the superseded images removed."""
+        generator = ChartGenerator(output_dir=str(tmp_path), max_workers=1)
+        
+        generator.generate_charts(*_metrics())
+        old_images = set(glob.glob(str(tmp_path / CACHED_IMAGES)))
+        chart_files = generator.generate_charts(*_metrics(scale=2))
+        new_images = set(glob.glob(str(tmp_path / CACHED_IMAGES)))
+        
+        # Charts whose data changed were redrawn; one current image per
+        # chart remains, none superseded ones from the first run
+        assert new_images != old_images
+        assert len(new_images) == len(chart_files)
+        assert {os.path.realpath(path) for path in chart_files.values()} == new_images
+        assert not glob.glob(str(tmp_path / "*.tmp.png"))
+    
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_generate_charts_matplotlib(self, tmp_path, max_workers):
+        """Test PNG rendering in-process and in a worker process pool."""
+        generator = ChartGenerator(output_dir=str(tmp_path), max_workers=max_workers)
+        
+        # Report enough cores for max_workers to decide between the two paths
+        with patch('os.cpu_count', return_value=4):
+            chart_files = generator.generate_charts(*_metrics())
+        
+        assert chart_files == {
+            name: str(tmp_path / f"{stem}.png") for name, stem in ALL_CHARTS.items()
+        }
+        for path in chart_files.values():
+            with Image.open(path) as image:
+                assert image.format == "PNG"
+                assert image.width > 0 and image.height > 0
+    
+    def test_generate_charts_vega_lite(self, tmp_path):
+        """Test that the Vega-Lite backend writes a spec per chart."""
+        generator = ChartGenerator(output_dir=str(tmp_path), backend="vega-lite")
+        
+        chart_files = generator.generate_charts(*_metrics())
+        
+        assert chart_files == {
+            name: str(tmp_path / f"{stem}.vl.json") for name, stem in ALL_CHARTS.items()
+        }
+        for path in chart_files.values():
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f)
+            assert spec["$schema"].startswith("https://vega.github.io/schema/vega-lite/")
+        assert not glob.glob(str(tmp_path / "*.png"))
+    
+    @pytest.mark.parametrize("backend, suffix", [("matplotlib", ".png"), ("vega-lite", ".vl.json")])
+    def test_generate_charts_skips_uninformative_charts(self, tmp_path, backend, suffix):
+        """Test that single-category and lopsided age charts are skipped."""
+        bucket_metrics, account_metrics = _metrics()
+        account_metrics["storage_classes"] = dict(list(account_metrics["storage_classes"].items())[:1])
+        account_metrics["regions"] = {"us-east-1": 2}
+        # More than 99% of objects are recent
+        account_metrics["age_buckets"] = {"recent": 995, "old": 5}
+        
+        generator = ChartGenerator(output_dir=str(tmp_path), max_workers=1, backend=backend)
+        chart_files = generator.generate_charts(bucket_metrics, account_metrics)
+        
+        assert set(chart_files) == {"filetype_pie", "top_buckets_bar", "dashboard"}
+        for path in chart_files.values():
+            assert path.endswith(suffix) and os.path.isfile(path)
+        for stem in ("storageclass_bar", "age_distribution_pie", "region_distribution_pie"):
+            assert not glob.glob(str(tmp_path / f"{stem}*"))
+    
+    def test_invalid_backend(self, tmp_path):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            ChartGenerator(output_dir=str(tmp_path), backend="svg")
@@ -2,6 +2,7 @@
 
 import json
 import tempfile
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -12,9 +13,11 @@ from s3_insight.inventory import S3Inventory
 class TestS3Inventory:
     """Test cases for S3Inventory class."""
     
-    def test_init(self):
+    @patch('boto3.Session')
+    def test_init(self, mock_session):
         """Test S3Inventory initialization."""
         inventory = S3Inventory(profile="test", sample_size=50000, verbose=True)
+        mock_session.assert_called_once_with(profile_name="test")
         assert inventory.profile == "test"
         assert inventory.sample_size == 50000
         assert inventory.verbose is True
@@ -35,6 +38,11 @@ class TestS3Inventory:
         # Test files without extension
         assert inventory._get_file_extension("README") == "no-extension"
         assert inventory._get_file_extension("Dockerfile") == "no-extension"
+        assert inventory._get_file_extension(".bashrc") == "no-extension"
+        assert inventory._get_file_extension("logs/.env") == "no-extension"
+        assert inventory._get_file_extension("archive.") == "no-extension"
+        assert inventory._get_file_extension("v1.2/README") == "no-extension"
+        assert inventory._get_file_extension("logs/.env.gz") == "gz"
         
         # Test directory-like keys
         assert inventory._get_file_extension("folder/") == "directory"
@@ -44,8 +52,9 @@ class TestS3Inventory:
         assert inventory._get_file_extension("file.TXT") == "txt"
         assert inventory._get_file_extension("image.JPG") == "jpg"
     
-    def test_write_and_load_inventory(self):
-        """Test writing and loading inventory data."""
+    @pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+    def test_write_and_load_inventory(self, suffix):
+        """Test writing and loading inventory data, plain and gzip-compressed."""
         inventory = S3Inventory()
         
         # Sample inventory data
@@ -64,7 +73,7 @@ class TestS3Inventory:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+        with tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False) as f:
             temp_file = f.name
         
         try:
@@ -81,11 +90,55 @@ class TestS3Inventory:
             assert loaded_data["bucket1"]["object_count"] == 100
             assert loaded_data["bucket2"]["total_size"] == 2048
             
+            # Compressed files carry the gzip magic number
+            with open(temp_file, 'rb') as f:
+                assert (f.read(2) == b'\x1f\x8b') == suffix.endswith('.gz')
+            
         finally:
             import os
             if os.path.exists(temp_file):
                 os.unlink(temp_file)
     
+    def test_write_inventory_non_json_scalars(self):
+        """Test that values without a JSON type are written as strings."""
+        from decimal import Decimal
+        
+        inventory = S3Inventory()
+        
+        test_data = {
+            "bucket1": {
+                "bucket_name": "bucket1",
+                "total_size": Decimal("1024"),
+                "owner": Path("team/storage"),
+            }
+        }
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+            temp_file = f.name
+        
+        try:
+            inventory.write_inventory(test_data, temp_file)
+            loaded_data = inventory.load_inventory(temp_file)
+            
+            assert loaded_data["bucket1"]["total_size"] == "1024"
+            assert loaded_data["bucket1"]["owner"] == "team/storage"
+        finally:
+            import os
+            os.unlink(temp_file)
+    
+    def test_load_inventory_empty_file(self):
+        """Test loading an empty inventory file."""
+        inventory = S3Inventory()
+        
+        with tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False) as f:
+            temp_file = f.name
+        
+        try:
+            assert inventory.load_inventory(temp_file) == {}
+        finally:
+            import os
+            os.unlink(temp_file)
+    
     @patch('boto3.Session')
     def test_discover_buckets_success(self, mock_session):
         """Test successful bucket discovery."""
@@ -107,6 +160,13 @@ class TestS3Inventory:
         
         assert buckets == ['bucket1', 'bucket2']
         mock_s3_client.list_buckets.assert_called_once()
+        assert mock_s3_client.get_bucket_location.call_count == 2
+        assert set(inventory._bucket_regions) == {'bucket1', 'bucket2'}
+        
+        # A second call is served from the instance without new requests
+        assert inventory.discover_buckets() == ['bucket1', 'bucket2']
+        mock_s3_client.list_buckets.assert_called_once()
+        assert mock_s3_client.get_bucket_location.call_count == 2
     
     @patch('boto3.Session')
     def test_discover_buckets_no_credentials(self, mock_session):
@@ -122,6 +182,34 @@ class TestS3Inventory:
         with pytest.raises(RuntimeError, match="Failed to discover buckets"):
             inventory.discover_buckets()
     
+    @patch('boto3.Session')
+    def test_lookup_region_falls_back_to_head_bucket(self, mock_session):
+        """Test region lookup from HeadBucket when GetBucketLocation is denied."""
+        from botocore.exceptions import ClientError
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_bucket_location.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Access Denied'}},
+            'GetBucketLocation'
+        )
+        mock_s3_client.head_bucket.side_effect = ClientError(
+            {
+                'Error': {'Code': '403', 'Message': 'Forbidden'},
+                'ResponseMetadata': {'HTTPHeaders': {'x-amz-bucket-region': 'eu-west-1'}},
+            },
+            'HeadBucket'
+        )
+        
+        mock_session_instance = Mock()
+        mock_session_instance.client.return_value = mock_s3_client
+        mock_session.return_value = mock_session_instance
+        
+        inventory = S3Inventory()
+        
+        assert inventory._lookup_region("test-bucket") == "eu-west-1"
+        assert inventory._lookup_region("test-bucket") == "eu-west-1"
+        mock_s3_client.get_bucket_location.assert_called_once()
+    
     @patch('boto3.Session')
     def test_inventory_bucket_access_denied(self, mock_session):
         """Test inventory collection with access denied."""
@@ -138,6 +226,17 @@ class TestS3Inventory:
         mock_s3_client.get_bucket_location.side_effect = ClientError(
             error_response, 'GetBucketLocation'
         )
+        # HeadBucket is denied too, but still reports the bucket's region
+        mock_s3_client.head_bucket.side_effect = ClientError(
+            {
+                'Error': {'Code': '403', 'Message': 'Forbidden'},
+                'ResponseMetadata': {'HTTPHeaders': {'x-amz-bucket-region': 'eu-west-1'}},
+            },
+            'HeadBucket'
+        )
+        mock_s3_client.list_objects_v2.side_effect = ClientError(
+            error_response, 'ListObjectsV2'
+        )
         
         mock_session_instance = Mock()
         mock_session_instance.client.return_value = mock_s3_client
@@ -150,4 +249,309 @@ class TestS3Inventory:
         assert result["error"] == "Access denied"
         assert result["object_count"] == 0
         assert result["total_size"] == 0
-        assert result["objects"] == [] 
\ No newline at end of file
+        assert result["objects"] == [] 
+    
+    @pytest.mark.parametrize("code, message", [
+        ("AccessDenied", "Access denied"),
+        ("NoSuchBucket", "Bucket no longer exists"),
+    ])
+    @patch('boto3.Session')
+    def test_inventory_bucket_listing_errors(self, mock_session, code, message):
+        """Test that known per-bucket listing errors become error entries."""
+        from botocore.exceptions import ClientError
+        
+        inventory = S3Inventory()
+        inventory._bucket_regions["test-bucket"] = "us-east-1"
+        error = ClientError({'Error': {'Code': code, 'Message': code}}, 'ListObjectsV2')
+        
+        with patch.object(inventory, '_iter_object_listing', side_effect=error):
+            result = inventory._inventory_bucket("test-bucket")
+        
+        assert result["error"] == message
+        assert result["object_count"] == 0
+        
+        error = ClientError({'Error': {'Code': 'SlowDown', 'Message': 'SlowDown'}}, 'ListObjectsV2')
+        with patch.object(inventory, '_iter_object_listing', side_effect=error):
+            with pytest.raises(ClientError):
+                inventory._inventory_bucket("test-bucket")
+    
+    @patch('boto3.Session')
+    def test_sharded_listing_covers_every_key(self, mock_session):
+        """Test that prefix-sharded listing returns each key exactly once."""
+        keys = sorted(
+            [f"{c}file{i}.txt" for c in "!/09AZaz~é" for i in range(300)]
+            + ["a", "z", "logs/"]
+        )
+        
+        def list_objects_v2(Bucket, MaxKeys=1000, StartAfter=""):
+            remaining = [k for k in keys if k > StartAfter]
+            return {
+                "Contents": [{"Key": k} for k in remaining[:MaxKeys]],
+                "IsTruncated": len(remaining) > MaxKeys,
+            }
+        
+        def paginate(Bucket, StartAfter="", PaginationConfig=None):
+            while True:
+                page = list_objects_v2(Bucket, StartAfter=StartAfter)
+                yield page
+                if not page["IsTruncated"]:
+                    return
+                StartAfter = page["Contents"][-1]["Key"]
+        
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.side_effect = list_objects_v2
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = paginate
+        mock_s3_client.list_bucket_inventory_configurations.return_value = {
+            "InventoryConfigurationList": []
+        }
+        
+        mock_session_instance = Mock()
+        mock_session_instance.client.return_value = mock_s3_client
+        mock_session.return_value = mock_session_instance
+        
+        for max_parallel_listings in (16, 1):
+            inventory = S3Inventory(max_parallel_listings=max_parallel_listings)
+            listed = [
+                obj["Key"]
+                for contents in inventory._iter_object_listing("bucket", "us-east-1", mock_s3_client)
+                for obj in contents
+            ]
+            
+            assert listed == keys
+    
+    @patch('boto3.Session')
+    def test_sharded_listing_stops_early(self, mock_session):
+        """Test that the sampling cut-off ends sharded listing early."""
+        import bisect
+        import threading
+        from datetime import datetime, timezone
+        
+        from s3_insight.inventory import LIST_SHARD_QUEUE_PAGES, LIST_SHARD_WORKERS
+        
+        now = datetime.now(timezone.utc)
+        keys = [f"{c}{i:04d}.txt" for c in "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+                for i in range(5000)]
+        listed_pages = []
+        
+        def list_objects_v2(Bucket, MaxKeys=1000, StartAfter=""):
+            start = bisect.bisect_right(keys, StartAfter)
+            listed_pages.append(StartAfter)
+            return {
+                "Contents": [
+                    {"Key": k, "Size": 1, "LastModified": now} for k in keys[start:start + MaxKeys]
+                ],
+                "IsTruncated": start + MaxKeys < len(keys),
+            }
+        
+        def paginate(Bucket, StartAfter="", PaginationConfig=None):
+            while True:
+                page = list_objects_v2(Bucket, StartAfter=StartAfter)
+                yield page
+                if not page["IsTruncated"]:
+                    return
+                StartAfter = page["Contents"][-1]["Key"]
+        
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.side_effect = list_objects_v2
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = paginate
+        mock_s3_client.list_bucket_inventory_configurations.return_value = {
+            "InventoryConfigurationList": []
+        }
+        
+        mock_session_instance = Mock()
+        mock_session_instance.client.return_value = mock_s3_client
+        mock_session.return_value = mock_session_instance
+        
+        inventory = S3Inventory(sample_size=100)
+        inventory._bucket_regions["test-bucket"] = "us-east-1"
+        threads_before = threading.active_count()
+        
+        with patch('s3_insight.inventory.SAMPLING_THRESHOLD', 2500):
+            result = inventory._inventory_bucket("test-bucket")
+        
+        assert result["object_count"] == 2501
+        assert len(result["objects"]) == 100
+        # Shards list only a few pages ahead of the consumer, and stop once
+        # the threshold is reached rather than finishing their key ranges
+        assert len(listed_pages) <= LIST_SHARD_WORKERS * (LIST_SHARD_QUEUE_PAGES + 2)
+        assert len(listed_pages) < len(keys) // 1000
+        assert threading.active_count() == threads_before
+    
+    @patch('boto3.Session')
+    def test_inventory_bucket_tallies(self, mock_session):
+        """Test per-page tallies and the sampling cut-off."""
+        from datetime import datetime, timedelta, timezone
+        
+        now = datetime.now(timezone.utc)
+        contents = [
+            {"Key": "a.txt", "Size": 10, "LastModified": now, "StorageClass": "STANDARD"},
+            {"Key": "b.TXT", "Size": 20, "LastModified": now - timedelta(days=60)},
+            {"Key": "logs/", "Size": 0, "LastModified": (now - timedelta(days=90)).replace(tzinfo=None),
+             "StorageClass": "GLACIER"},
+            {"Key": "c.jpg", "Size": 5, "LastModified": now},
+        ]
+        
+        inventory = S3Inventory()
+        inventory._bucket_regions["test-bucket"] = "eu-west-1"
+        
+        with patch.object(inventory, '_iter_object_listing', return_value=iter([contents[:2], contents[2:]])), \
+                patch('s3_insight.inventory.SAMPLING_THRESHOLD', 2):
+            result = inventory._inventory_bucket("test-bucket")
+        
+        # Three objects are counted (one past the threshold), all are stored
+        assert result["region"] == "eu-west-1"
+        assert result["object_count"] == 3
+        assert result["total_size"] == 30
+        assert result["storage_classes"] == {"STANDARD": 2, "GLACIER": 1}
+        assert result["file_extensions"] == {
+            "txt": {"count": 2, "size": 30},
+            "directory": {"count": 1, "size": 0},
+        }
+        assert result["age_buckets"] == {"recent": 1, "old": 2}
+        assert result["sampled"] is False
+        assert [obj["key"] for obj in result["objects"]] == ["a.txt", "b.TXT", "logs/"]
+    
+    @patch('boto3.Session')
+    def test_inventory_bucket_caps_stored_objects(self, mock_session):
+        """Test that per-object records are a uniform sample of sample_size."""
+        from datetime import datetime, timezone
+        
+        now = datetime.now(timezone.utc)
+        keys = [f"file{i:04d}.txt" for i in range(2500)]
+        pages = [
+            [{"Key": key, "Size": 1, "LastModified": now} for key in keys[i:i + 1000]]
+            for i in range(0, len(keys), 1000)
+        ]
+        
+        inventory = S3Inventory(sample_size=100)
+        inventory._bucket_regions["test-bucket"] = "us-east-1"
+        
+        with patch.object(inventory, '_iter_object_listing', return_value=iter(pages)):
+            result = inventory._inventory_bucket("test-bucket")
+        
+        stored = [obj["key"] for obj in result["objects"]]
+        assert result["object_count"] == 2500
+        assert result["sampled"] is True
+        assert result["sample_size"] == 100
+        assert len(set(stored)) == 100
+        assert set(stored) <= set(keys)
+        # Later pages are represented, not just the first sample_size keys
+        assert max(stored) > keys[99]
+    
+    @pytest.mark.parametrize("file_format", ["Parquet", "CSV"])
+    @patch('boto3.Session')
+    def test_large_bucket_read_from_s3_inventory_report(self, mock_session, file_format):
+        """Test that a recent S3 Inventory report replaces listing."""
+        import gzip
+        import io
+        import time
+        from datetime import datetime, timezone
+        
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from botocore.exceptions import ClientError
+        
+        last_modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        if file_format == "Parquet":
+            buffer = io.BytesIO()
+            pq.write_table(pa.table({
+                "bucket": ["src", "src"],
+                "key": ["a b.txt", "logs/"],
+                "size": [10, 0],
+                "last_modified_date": pa.array([last_modified] * 2, pa.timestamp("ms", tz="UTC")),
+                "storage_class": ["STANDARD", "GLACIER"],
+            }), buffer)
+            data_file = buffer.getvalue()
+            file_schema = "message s3.inventory { }"
+        else:
+            data_file = gzip.compress(
+                b'"src","a+b.txt","10","2024-01-01T00:00:00.000Z","STANDARD"\n'
+                b'"src","logs%2F","0","2024-01-01T00:00:00.000Z","GLACIER"\n'
+            )
+            file_schema = "Bucket, Key, Size, LastModifiedDate, StorageClass"
+        
+        manifest = {
+            "sourceBucket": "src",
+            "destinationBucket": "arn:aws:s3:::reports",
+            "fileFormat": file_format,
+            "fileSchema": file_schema,
+            "files": [{"key": "inv/src/daily/data/part-0"}],
+            "creationTimestamp": str(int(time.time() * 1000)),
+        }
+        objects = {
+            "inv/src/daily/2024-01-01T01-00Z/manifest.json": json.dumps(manifest).encode(),
+            "inv/src/daily/data/part-0": data_file,
+        }
+        
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [{"Key": "a b.txt"}], "IsTruncated": True
+        }
+        mock_s3_client.list_bucket_inventory_configurations.return_value = {
+            "InventoryConfigurationList": [{
+                "Id": "daily",
+                "IsEnabled": True,
+                "IncludedObjectVersions": "Current",
+                "OptionalFields": ["Size", "LastModifiedDate", "StorageClass"],
+                "Destination": {"S3BucketDestination": {
+                    "Bucket": "arn:aws:s3:::reports", "Prefix": "inv", "Format": file_format,
+                }},
+            }]
+        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {"CommonPrefixes": [
+                {"Prefix": "inv/src/daily/2024-01-01T01-00Z/"},
+                # The newest run has no manifest yet, so the previous run
+                # is used; data/ and hive/ are not runs
+                {"Prefix": "inv/src/daily/2024-01-02T01-00Z/"},
+                {"Prefix": "inv/src/daily/data/"},
+                {"Prefix": "inv/src/daily/hive/"},
+            ]}
+        ]
+        
+        def get_object(Bucket, Key):
+            if Key not in objects:
+                raise ClientError({"Error": {"Code": "NoSuchKey", "Message": Key}}, "GetObject")
+            return {"Body": io.BytesIO(objects[Key])}
+        
+        mock_s3_client.get_object.side_effect = get_object
+        
+        mock_session_instance = Mock()
+        mock_session_instance.client.return_value = mock_s3_client
+        mock_session.return_value = mock_session_instance
+        
+        inventory = S3Inventory()
+        listed = [
+            obj
+            for contents in inventory._iter_object_listing("src", "us-east-1", mock_s3_client)
+            for obj in contents
+        ]
+        
+        assert [(obj["Key"], obj["Size"], obj["StorageClass"]) for obj in listed] == [
+            ("a b.txt", 10, "STANDARD"),
+            ("logs/", 0, "GLACIER"),
+        ]
+        assert all(obj["LastModified"] == last_modified for obj in listed)
+    
+    @patch('boto3.Session')
+    def test_inventory_bucket_summary_only(self, mock_session):
+        """Test that summary-only inventories count every object but keep none."""
+        from datetime import datetime, timezone
+        
+        now = datetime.now(timezone.utc)
+        contents = [
+            {"Key": f"file{i}.txt", "Size": 1, "LastModified": now} for i in range(4)
+        ]
+        
+        inventory = S3Inventory(summary_only=True)
+        inventory._bucket_regions["test-bucket"] = "us-east-1"
+        
+        with patch.object(inventory, '_iter_object_listing', return_value=iter([contents[:2], contents[2:]])), \
+                patch('s3_insight.inventory.SAMPLING_THRESHOLD', 2):
+            result = inventory._inventory_bucket("test-bucket")
+        
+        assert result["object_count"] == 4
+        assert result["total_size"] == 4
+        assert result["objects"] == []
+        assert result["sample_size"] == 0
+        assert result["sampled"] is False